@@ -4,7 +4,10 @@ from components.styles import load_styles
 from components.championship import show_championship_tab
 from components.calendar import show_calendar_tab
 from components.race_analysis import show_race_analysis_tab
-from utils.api import get_f1_data
+from components.career import show_career_tab
+from components.navigation import lazy_tabs
+from components.streamlit_adapter import install
+from utils.config import FIRST_SEASON
 from utils.parsers import parse_driver_standings, parse_constructor_standings
 
 # Set page configuration with a custom theme and dark mode
@@ -18,6 +21,9 @@ st.set_page_config(
 # Load custom CSS
 load_styles()
 
+# Report data-layer errors on the page
+install()
+
 def main():
     # Title with dynamic F1 logo and styling
     st.markdown('<h1 class="main-header">🏎️ F1 Explorer Dashboard</h1>', unsafe_allow_html=True)
@@ -27,7 +33,7 @@ def main():
         st.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
         
         # Year selection
-        years = list(range(2000, datetime.now().year + 1))
+        years = list(range(FIRST_SEASON, datetime.now().year + 1))
         year = st.selectbox("Select Season", years, index=len(years)-1)
         
         # Display current standings leaders
@@ -36,15 +42,17 @@ def main():
         
         if not ds.empty:
             leader = ds.iloc[0]
+            # No constructors' championship before 1958
+            constructor_leader = "" if cs.empty else (
+                '<p style="margin: 0; font-size: 0.9rem;"><span style="color: #e10600; font-weight: bold;">Constructor:</span> '
+                f"{cs.iloc[0]['Constructor']} ({cs.iloc[0]['Points']} pts)</p>"
+            )
             st.markdown(f"""
             <div style="margin-top: 20px; padding: 10px; background-color: rgba(255,255,255,0.1); border-radius: 5px;">
                 <h3 style="margin: 0; font-size: 1rem;">Current Leaders</h3>
                 <p style="margin-bottom: 5px; font-size: 0.9rem;">
                     <span style="color: #e10600; font-weight: bold;">Driver:</span> {leader['Driver']} ({leader['Points']} pts)
-                </p>
-                <p style="margin: 0; font-size: 0.9rem;">
-                    <span style="color: #e10600; font-weight: bold;">Constructor:</span> {cs.iloc[0]['Constructor']} ({cs.iloc[0]['Points']} pts)
-                </p>
+                </p>{constructor_leader}
             </div>
             """, unsafe_allow_html=True)
         
@@ -59,20 +67,30 @@ def main():
         </div>
         """, unsafe_allow_html=True)
     
-    # Create tabs with enhanced styling
-    tab1, tab2, tab3 = st.tabs(["📊 Championship", "🗓️ Calendar", "🏁 Race Analysis"])
+    # Create tabs with enhanced styling; only the open tab fetches and renders
+    (tab1, show1), (tab2, show2), (tab3, show3), (tab4, show4) = lazy_tabs(
+        ["📊 Championship", "🗓️ Calendar", "🏁 Race Analysis", "📈 Careers"], key="main_tab"
+    )
     
     # Tab 1: Standings
     with tab1:
-        show_championship_tab(year)
+        if show1:
+            show_championship_tab(year)
     
     # Tab 2: Calendar
     with tab2:
-        show_calendar_tab(year)
+        if show2:
+            show_calendar_tab(year)
     
     # Tab 3: Race Analysis
     with tab3:
-        show_race_analysis_tab(year)
+        if show3:
+            show_race_analysis_tab(year)
+    
+    # Tab 4: Career statistics across all stored seasons
+    with tab4:
+        if show4:
+            show_career_tab()
     
     # Footer
     st.markdown(f"""
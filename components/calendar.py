@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from utils.parsers import parse_races
+from components.tables import show_table, highlight_styles
 from visualizations.calendar import create_calendar_map
 
 def show_calendar_tab(year):
@@ -40,11 +41,7 @@ def show_calendar_tab(year):
         
         if pd.notnull(next_race_index):
             next_race_round = races.loc[next_race_index, 'round']
-            styled_calendar = calendar_df.style.apply(
-                lambda x: ['background-color: #e10600; color: white' if r == next_race_round else '' 
-                          for r in calendar_df['Round']], axis=1
-            )
-            st.dataframe(styled_calendar, use_container_width=True)
+            show_table(calendar_df, highlight_styles(calendar_df['Round'] == next_race_round))
         else:
             st.dataframe(calendar_df, use_container_width=True)
     
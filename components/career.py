@@ -0,0 +1,28 @@
+import streamlit as st
+from components.tables import paged_table
+from utils.career import career_stats
+
+def show_career_tab():
+    """
+    Display career statistics of drivers and constructors across every stored season
+    """
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    
+    table = st.radio("Career statistics", ["Drivers", "Constructors"], horizontal=True, key="career_table")
+    
+    with st.spinner("Updating career statistics..."):
+        stats = career_stats(table.lower())
+    
+    if stats.empty:
+        st.info("No stored results yet. Browse some seasons or run python -m tools.ingest first.")
+    else:
+        name = 'Driver' if table == "Drivers" else 'Constructor'
+        st.caption("Across every season stored locally. A DNF is any result not classified as finished.")
+        paged_table(
+            stats.drop(columns=['DriverID', 'ConstructorID'], errors='ignore'),
+            key=f"career_{table.lower()}",
+            search_columns=[name],
+            decimals={'Points': 1, 'Avg Finish': 2},
+        )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -1,5 +1,6 @@
 import streamlit as st
-from utils.parsers import parse_driver_standings, parse_constructor_standings
+from components.tables import show_table, podium_styles
+from utils.parsers import parse_driver_standings, parse_constructor_standings, KEY_COLUMNS
 from visualizations.standings import create_driver_standings_chart, create_constructor_standings_chart
 
 def show_championship_tab(year):
@@ -16,7 +17,7 @@ def show_championship_tab(year):
         ds = parse_driver_standings(year)
         cs = parse_constructor_standings(year)
     
-    if ds.empty or cs.empty:
+    if ds.empty:
         st.info(f"No championship data available for {year}.")
     else:
         # Create two columns for standings
@@ -25,13 +26,8 @@ def show_championship_tab(year):
         with col1:
             st.markdown('<h2 class="subheader">Drivers Championship</h2>', unsafe_allow_html=True)
             
-            # Format the dataframe
-            styled_ds = ds.style.apply(lambda x: ['background-color: #e10600; color: white' if i == 0 
-                                            else 'background-color: #0600EF; color: white' if i == 1 
-                                            else 'background-color: #FFC0CB; color: black' if i == 2 
-                                            else '' for i in range(len(x))], axis=0)
-            
-            st.dataframe(styled_ds, use_container_width=True)
+            # Podium rows highlighted
+            show_table(ds.drop(columns=KEY_COLUMNS, errors='ignore'), podium_styles(ds['Position']))
             
             # Add visualization
             driver_chart = create_driver_standings_chart(ds)
@@ -41,17 +37,15 @@ def show_championship_tab(year):
         with col2:
             st.markdown('<h2 class="subheader">Constructors Championship</h2>', unsafe_allow_html=True)
             
-            # Format the dataframe
-            styled_cs = cs.style.apply(lambda x: ['background-color: #e10600; color: white' if i == 0 
-                                            else 'background-color: #0600EF; color: white' if i == 1 
-                                            else 'background-color: #FFC0CB; color: black' if i == 2 
-                                            else '' for i in range(len(x))], axis=0)
-            
-            st.dataframe(styled_cs, use_container_width=True)
-            
-            # Add visualization
-            constructor_chart = create_constructor_standings_chart(cs)
-            if constructor_chart:
-                st.plotly_chart(constructor_chart, use_container_width=True)
+            if cs.empty:
+                st.info("The constructors' championship was first held in 1958.")
+            else:
+                # Podium rows highlighted
+                show_table(cs.drop(columns=KEY_COLUMNS, errors='ignore'), podium_styles(cs['Position']))
+                
+                # Add visualization
+                constructor_chart = create_constructor_standings_chart(cs)
+                if constructor_chart:
+                    st.plotly_chart(constructor_chart, use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,28 @@
+import streamlit as st
+from utils.config import LAZY_TABS
+
+def lazy_tabs(labels, key):
+    """
+    Create tabs whose bodies only need to run when they are on screen
+    
+    st.tabs normally executes every tab body on each rerun. In lazy mode the
+    tabs rerun the script when switched and report which one is open, so
+    callers can skip the parsers and figures of hidden tabs.
+    
+    Args:
+        labels: Tab labels
+        key: Unique widget key, also used to remember the selected tab
+        
+    Returns:
+        List of (container, is_open) tuples, one per label
+    """
+    if not LAZY_TABS:
+        return [(tab, True) for tab in st.tabs(labels)]
+    
+    try:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+        return [(tab, bool(tab.open)) for tab in tabs]
+    except TypeError:
+        # Streamlit versions without lazy tabs: emulate them with a horizontal radio
+        selected = st.radio(key, labels, key=key, horizontal=True, label_visibility="collapsed")
+        return [(st.container(), label == selected) for label in labels]
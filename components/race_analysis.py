@@ -1,11 +1,20 @@
 import streamlit as st
-from utils.parsers import parse_races, parse_results, parse_qualifying, parse_sprint, parse_pitstops, parse_laps, get_race_details
+from utils.parsers import parse_races, parse_results, parse_qualifying, parse_sprint, parse_pitstops, get_race_details, KEY_COLUMNS
+from utils.laps import get_lap_matrix, slice_laps
+from utils.timing import format_laptime
+from utils.prefetch import prefetch_round, prefetch_season
+from components.navigation import lazy_tabs
+from components.tables import show_table, podium_styles, paged_table
 from visualizations.race_analysis import create_race_results_positions, create_lap_times_chart
 
+@st.fragment
 def show_race_analysis_tab(year):
     """
     Display the race analysis tab with race results, qualifying, etc.
     
+    Runs as a fragment: changing the round only reruns this panel, not the
+    sidebar standings or the other sections.
+    
     Args:
         year: The year to show race analysis for
     """
@@ -17,6 +26,9 @@ def show_race_analysis_tab(year):
     if races.empty:
         st.info(f"No race data available for {year}.")
     else:
+        # Warm the rest of the season in the background so switching rounds is instant
+        prefetch_season(year, races.loc[races['completed'], 'round'].tolist())
+        
         # Race selector with enhanced UI
         col1, col2 = st.columns([1, 2])
         
@@ -43,19 +55,30 @@ def show_race_analysis_tab(year):
                 """, unsafe_allow_html=True)
         
         # Create tabs for different race data
-        race_tab1, race_tab2, race_tab3, race_tab4 = st.tabs(["🏆 Results", "⏱️ Qualifying", "🚀 Sprint", "📊 Analysis"])
+        (race_tab1, show1), (race_tab2, show2), (race_tab3, show3), (race_tab4, show4) = lazy_tabs(
+            ["🏆 Results", "⏱️ Qualifying", "🚀 Sprint", "📊 Analysis"], key="race_tab"
+        )
+        
+        # Wait only for the open tab's data; the rest of the round is warmed in the background
+        open_endpoints = [name for name, show in (("results", show1), ("qualifying", show2), ("sprint", show3)) if show]
+        with st.spinner("Loading race data..."):
+            prefetch_round(year, rnd, open_endpoints)
         
         with race_tab1:
-            show_race_results_tab(year, rnd)
+            if show1:
+                show_race_results_tab(year, rnd)
         
         with race_tab2:
-            show_qualifying_tab(year, rnd)
+            if show2:
+                show_qualifying_tab(year, rnd)
         
         with race_tab3:
-            show_sprint_tab(year, rnd)
+            if show3:
+                show_sprint_tab(year, rnd)
         
         with race_tab4:
-            show_race_analysis_details_tab(year, rnd)
+            if show4:
+                show_race_analysis_details_tab(year, rnd)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -86,14 +109,7 @@ def show_race_results_tab(year, rnd):
             display_cols.insert(5, 'Time')
         
         # Then style the filtered dataframe
-        styled_results = results_df[display_cols].style.apply(
-            lambda x: ['background-color: #e10600; color: white' if pos == 1 
-                      else 'background-color: #0600EF; color: white' if pos == 2
-                      else 'background-color: #FFC0CB; color: black' if pos == 3
-                      else '' for pos in results_df['Position']], axis=0
-        )
-        
-        st.dataframe(styled_results, use_container_width=True)
+        show_table(results_df[display_cols], podium_styles(results_df['Position']))
 
 def show_qualifying_tab(year, rnd):
     """
@@ -111,38 +127,18 @@ def show_qualifying_tab(year, rnd):
     else:
         st.markdown('<h3 class="subheader">Qualifying Results</h3>', unsafe_allow_html=True)
         
-        # Style the qualifying dataframe
-        styled_quali = quali_df.style.apply(
-            lambda x: ['background-color: #e10600; color: white' if pos == 1 
-                      else 'background-color: #0600EF; color: white' if pos == 2
-                      else 'background-color: #FFC0CB; color: black' if pos == 3
-                      else '' for pos in quali_df['Position']], axis=0
-        )
-        
-        st.dataframe(styled_quali, use_container_width=True)
+        # Show session times as lap times; the chart below keeps the float seconds
+        display_df = quali_df.drop(columns=KEY_COLUMNS, errors='ignore')
+        for session in ('Q1', 'Q2', 'Q3'):
+            if session in display_df.columns:
+                display_df[session] = format_laptime(display_df[session])
+        show_table(display_df, podium_styles(quali_df['Position']))
         
         # Add visualization - Q1, Q2, Q3 comparison if data exists
         if 'Q1' in quali_df.columns and 'Q2' in quali_df.columns and 'Q3' in quali_df.columns:
-            # Convert session times to seconds for comparison
-            def session_to_seconds(time_str):
-                if not isinstance(time_str, str):
-                    return None
-                try:
-                    if ":" in time_str:
-                        minutes, rest = time_str.split(':')
-                        return int(minutes) * 60 + float(rest)
-                    else:
-                        return float(time_str)
-                except:
-                    return None
-            
-            plot_df = quali_df.copy()
-            for session in ['Q1', 'Q2', 'Q3']:
-                if session in plot_df.columns:
-                    plot_df[f"{session}_seconds"] = plot_df[session].apply(session_to_seconds)
-            
+            # Session times are already numeric seconds from the parser.
             # Filter drivers who participated in all sessions (front-runners)
-            plot_df = plot_df.dropna(subset=['Q1_seconds', 'Q2_seconds', 'Q3_seconds'])
+            plot_df = quali_df.dropna(subset=['Q1', 'Q2', 'Q3'])
             
             if not plot_df.empty and len(plot_df) >= 3:  # Ensure we have enough data
                 # Create session comparison chart
@@ -153,7 +149,7 @@ def show_qualifying_tab(year, rnd):
                 for session in ['Q1', 'Q2', 'Q3']:
                     fig.add_trace(go.Bar(
                         x=plot_df['Driver'],
-                        y=plot_df[f"{session}_seconds"],
+                        y=plot_df[session],
                         name=session,
                         hovertemplate='%{y:.3f}s'
                     ))
@@ -187,14 +183,7 @@ def show_sprint_tab(year, rnd):
         st.markdown('<h3 class="subheader">Sprint Results</h3>', unsafe_allow_html=True)
         
         # Style the sprint dataframe
-        styled_sprint = sprint_df.style.apply(
-            lambda x: ['background-color: #e10600; color: white' if pos == 1 
-                      else 'background-color: #0600EF; color: white' if pos == 2
-                      else 'background-color: #FFC0CB; color: black' if pos == 3
-                      else '' for pos in sprint_df['Position']], axis=0
-        )
-        
-        st.dataframe(styled_sprint, use_container_width=True)
+        show_table(sprint_df.drop(columns=KEY_COLUMNS, errors='ignore'), podium_styles(sprint_df['Position']))
 
 def show_race_analysis_details_tab(year, rnd):
     """
@@ -207,18 +196,23 @@ def show_race_analysis_details_tab(year, rnd):
     st.markdown('<h3 class="subheader">Race Analysis</h3>', unsafe_allow_html=True)
     
     # Create multi-tab analysis
-    analysis_tab1, analysis_tab2 = st.tabs(["Lap Times", "Pit Stops"])
+    (analysis_tab1, show1), (analysis_tab2, show2) = lazy_tabs(["Lap Times", "Pit Stops"], key="analysis_tab")
     
     with analysis_tab1:
-        show_lap_times_tab(year, rnd)
+        if show1:
+            show_lap_times_tab(year, rnd)
     
     with analysis_tab2:
-        show_pit_stops_tab(year, rnd)
+        if show2:
+            show_pit_stops_tab(year, rnd)
 
+@st.fragment
 def show_lap_times_tab(year, rnd):
     """
     Display lap times analysis tab
     
+    Runs as a fragment: changing the driver selection only reruns this panel.
+    
     Args:
         year: The year of the race
         rnd: The round number
@@ -228,26 +222,29 @@ def show_lap_times_tab(year, rnd):
         results_df = parse_results(year, rnd)
         
         if not results_df.empty:
-            # Create driver selector
-            drivers = results_df['Driver'].tolist()
-            selected_driver = st.selectbox("Select Driver", drivers)
-            
-            # Extract driver_id from full name for API call (extract last name and use lowercase)
-            driver_id = selected_driver.split()[-1].lower()
+            # Create driver selector keyed by the real driverId
+            driver_names = dict(zip(results_df['DriverID'], results_df['Driver']))
+            selected_ids = st.multiselect(
+                "Select Drivers",
+                list(driver_names),
+                default=list(driver_names)[:1],
+                format_func=driver_names.get,
+            )
             
-            # Get lap times for the selected driver
-            lap_times_df = parse_laps(year, rnd, driver_id)
+            # The whole race is fetched once; each selection is an in-memory slice
+            lap_matrix = get_lap_matrix(year, rnd)
+            lap_times_df = slice_laps(lap_matrix, selected_ids)
             
             if lap_times_df.empty:
-                st.info(f"No lap time data available for {selected_driver}.")
+                st.info("No lap time data available for the selected drivers.")
             else:
                 # Create lap time chart
-                lap_chart = create_lap_times_chart(lap_times_df, driver_id)
+                lap_chart = create_lap_times_chart(lap_times_df, selected_ids[0] if len(selected_ids) == 1 else None)
                 if lap_chart:
                     st.plotly_chart(lap_chart, use_container_width=True)
                 
-                # Display table of lap times
-                st.dataframe(lap_times_df, use_container_width=True)
+                # Display table of lap times, one page at a time
+                paged_table(lap_times_df, key=f"laps_{year}_{rnd}", filter_columns=['DriverID'], decimals={'Time': 3})
         else:
             st.info("No race results available to select drivers.")
 
@@ -299,4 +296,4 @@ def show_pit_stops_tab(year, rnd):
         st.plotly_chart(fig, use_container_width=True)
         
         # Show pit stop table
-        st.dataframe(pitstop_df, use_container_width=True)
\ No newline at end of file
+        paged_table(pitstop_df, key=f"pitstops_{year}_{rnd}", filter_columns=['DriverID'], decimals={'Duration': 3})
\ No newline at end of file
@@ -0,0 +1,11 @@
+import streamlit as st
+from utils.api import set_error_handler
+
+def install():
+    """
+    Connect the Streamlit-free data layer in utils to the UI
+    
+    Fetch errors raised while parsing are shown on the page with st.error
+    instead of only being logged.
+    """
+    set_error_handler(st.error)
@@ -0,0 +1,163 @@
+import weakref
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.config import STYLER_MAX_ROWS, TABLE_PAGE_SIZE
+from utils.memo import frame_digest
+
+# Row styles for P1, P2 and P3
+PODIUM_STYLES = np.array([
+    'background-color: #e10600; color: white',
+    'background-color: #0600EF; color: white',
+    'background-color: #FFC0CB; color: black',
+], dtype=object)
+
+HIGHLIGHT_STYLE = PODIUM_STYLES[0]
+
+def podium_styles(positions):
+    """
+    CSS for each row from its finishing position, computed in one pass
+    
+    Args:
+        positions: Array-like of positions (1-based)
+        
+    Returns:
+        NumPy object array with one style string per row
+    """
+    idx = np.asarray(positions, dtype=np.int64) - 1
+    styles = np.full(len(idx), '', dtype=object)
+    podium = (idx >= 0) & (idx < len(PODIUM_STYLES))
+    styles[podium] = PODIUM_STYLES[idx[podium]]
+    return styles
+
+def highlight_styles(mask, style=HIGHLIGHT_STYLE):
+    """
+    CSS for each row: style where mask is True, nothing elsewhere
+    
+    Returns:
+        NumPy object array with one style string per row
+    """
+    return np.where(np.asarray(mask, dtype=bool), style, '').astype(object)
+
+def show_table(df, row_styles=None, decimals=None, max_styled_rows=STYLER_MAX_ROWS):
+    """
+    Display a DataFrame with whole-row styles and numeric formats
+    
+    The style of every cell is built once as a NumPy array and handed to the
+    Styler in a single apply call. Tables longer than max_styled_rows skip the
+    Styler entirely and are formatted through column configuration only, which
+    Streamlit renders much faster.
+    
+    Args:
+        df: DataFrame to display
+        row_styles: Optional array with one CSS string per row
+        decimals: Optional {column: number of decimals} for float columns
+        max_styled_rows: Largest table still rendered through a Styler
+    """
+    decimals = {col: n for col, n in (decimals or {}).items() if col in df.columns}
+    
+    if row_styles is None or len(df) > max_styled_rows:
+        column_config = {col: st.column_config.NumberColumn(format=f"%.{n}f") for col, n in decimals.items()}
+        st.dataframe(df, column_config=column_config or None, use_container_width=True)
+        return
+    
+    cell_styles = pd.DataFrame(
+        np.repeat(np.asarray(row_styles, dtype=object)[:, None], df.shape[1], axis=1),
+        index=df.index,
+        columns=df.columns,
+    )
+    styled = df.style.apply(lambda _: cell_styles, axis=None)
+    if decimals:
+        styled = styled.format({col: f"{{:.{n}f}}" for col, n in decimals.items()}, na_rep='')
+    st.dataframe(styled, use_container_width=True)
+
+def _sort_order(df, key, column):
+    """
+    Row permutation sorting df by column, computed once per table content
+    
+    Orders are kept in session state next to the frame they belong to, so
+    paging and filtering reuse them instead of re-sorting. Fragment reruns
+    pass the very same frame object, recognised without hashing it; only a
+    new object is hashed to tell whether its content changed.
+    """
+    index = st.session_state.get(f"{key}_index")
+    if index is None or index['frame']() is not df:
+        digest = frame_digest(df)
+        if index is None or index['digest'] != digest:
+            index = {'digest': digest, 'orders': {}}
+        index['frame'] = weakref.ref(df)
+        st.session_state[f"{key}_index"] = index
+    if column not in index['orders']:
+        index['orders'][column] = df[column].argsort(kind='stable').to_numpy()
+    return index['orders'][column]
+
+@st.fragment
+def paged_table(df, key, filter_columns=(), search_columns=(), row_styles=None, decimals=None):
+    """
+    Display a large DataFrame one page at a time
+    
+    The full frame stays on the server; filters are boolean masks, sorting
+    reuses a cached row permutation per column, and only the rows of the
+    current page are sent to the browser. Runs as a fragment, so paging,
+    sorting and filtering only rerun the table.
+    
+    Args:
+        df: DataFrame to display
+        key: Unique key for the table's widgets and cached sort orders
+        filter_columns: Columns offered as multi-select filters (categoricals work best)
+        search_columns: Text columns matched by the search box
+        row_styles: Optional array with one CSS string per row of df, as for
+            show_table; only the current page's entries are applied
+        decimals: Optional {column: number of decimals} for float columns
+    """
+    if df.empty:
+        st.info("No rows to show.")
+        return
+    
+    mask = np.ones(len(df), dtype=bool)
+    
+    controls = st.columns(len(filter_columns) + (1 if search_columns else 0) + 2)
+    for col, column in zip(controls, filter_columns):
+        # Offer only the values present, and forget choices the current frame no longer has
+        options = sorted(df[column].dropna().unique())
+        filter_key = f"{key}_filter_{column}"
+        if filter_key in st.session_state:
+            st.session_state[filter_key] = [value for value in st.session_state[filter_key] if value in options]
+        chosen = col.multiselect(column, options, key=filter_key)
+        if chosen:
+            mask &= df[column].isin(chosen).to_numpy()
+    
+    if search_columns:
+        text = controls[len(filter_columns)].text_input("Search", key=f"{key}_search").strip()
+        if text:
+            hits = np.zeros(len(df), dtype=bool)
+            for column in search_columns:
+                hits |= df[column].astype(str).str.contains(text, case=False, regex=False).to_numpy()
+            mask &= hits
+    
+    sort_by = controls[-2].selectbox("Sort by", list(df.columns), key=f"{key}_sort")
+    descending = controls[-1].toggle("Descending", key=f"{key}_desc")
+    
+    order = _sort_order(df, key, sort_by)
+    if descending:
+        order = order[::-1]
+    rows = order[mask[order]]
+    
+    page_size = TABLE_PAGE_SIZE
+    pages = max(1, -(-len(rows) // page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    
+    page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    start = (page - 1) * page_size
+    page_rows = rows[start:start + page_size]
+    page_df = df.iloc[page_rows]
+    # Number rows by their position in the full table
+    page_df.index = page_rows
+    
+    show_table(page_df, None if row_styles is None else np.asarray(row_styles, dtype=object)[page_rows], decimals)
+    st.caption(
+        f"Rows {start + 1 if len(rows) else 0}-{min(start + page_size, len(rows))} of {len(rows)}"
+        + (f" (filtered from {len(df)})" if len(rows) != len(df) else "")
+    )
@@ -0,0 +1,190 @@
+"""
+Headless HTTP API serving the dashboard's parsed frames
+
+Routes mirror the Ergast layout, with the kinds of utils.bundle:
+
+    GET /{year}/{kind}          races, driver_standings, constructor_standings
+    GET /{year}/{round}/{kind}  results, qualifying, sprint, pitstops, laps (?driver=<driverId>)
+    GET /stats                  HTTP client and memory cache statistics
+
+Frames are returned as JSON records, an Arrow IPC stream or Parquet, chosen
+with ?format=json|arrow|parquet or the Accept header (JSON by default). The
+service shares the persistent, shared and bundle caches with the dashboard;
+bundled seasons are streamed straight from the memory-mapped bundle file.
+
+    python data_api.py --port 8080
+    curl -H 'Accept: application/vnd.apache.arrow.stream' localhost:8080/2021/5/laps
+"""
+import argparse
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils import http, parsers
+from utils.api import APIError, fetch_all
+from utils.arrow import frame_to_ipc
+from utils.bundle import SEASON_KINDS, ROUND_KINDS, kind_endpoint, load_season_bundle
+from utils.memo import memory_usage
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+class RequestError(Exception):
+    """
+    Raised for requests that cannot be served, carrying the HTTP status
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def negotiate(query, accept):
+    """
+    Pick the response format from ?format= or the Accept header
+    
+    Returns:
+        One of the keys of CONTENT_TYPES
+    """
+    fmt = query.get('format', [None])[0]
+    if fmt is None:
+        fmt = next((name for name, ctype in CONTENT_TYPES.items() if ctype in (accept or '')), 'json')
+    if fmt not in CONTENT_TYPES:
+        raise RequestError(400, f"Unknown format {fmt!r}; use one of {', '.join(CONTENT_TYPES)}")
+    return fmt
+
+def encode(df, fmt):
+    """
+    Serialize a parsed frame in the requested format
+    
+    Returns:
+        bytes of the response body
+    """
+    if fmt == 'json':
+        return df.to_json(orient='records', date_format='iso').encode()
+    if fmt == 'arrow' and not df.empty:
+        return frame_to_ipc(df)
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    if fmt == 'parquet':
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def route(path):
+    """
+    Split a request path into (year, round, kind)
+    
+    Raises:
+        RequestError: 404 for paths that name no frame
+    """
+    parts = path.strip('/').split('/')
+    try:
+        if len(parts) == 2 and parts[1] in SEASON_KINDS:
+            return int(parts[0]), None, parts[1]
+        if len(parts) == 3 and parts[2] in ROUND_KINDS:
+            return int(parts[0]), int(parts[1]), parts[2]
+    except ValueError:
+        pass
+    raise RequestError(404, f"No frame at {path}")
+
+def bundled_payload(year, kind, rnd):
+    """
+    Arrow IPC payload of a bundled frame, as a buffer into the mapped file
+    
+    Returns:
+        pyarrow Buffer, or None if the frame is not bundled (or empty)
+    """
+    bundle = load_season_bundle(year)
+    if bundle is None:
+        return None
+    payloads, index = bundle
+    row = index.get((kind, rnd))
+    if row is None:
+        return None
+    payload = payloads[row].as_buffer()
+    return payload if payload.size else None
+
+def load(year, kind, rnd=None, driver_id=None):
+    """
+    Parse a frame, failing loudly instead of returning an empty one
+    
+    The parsers report fetch errors and return an empty frame; fetching
+    first turns an upstream failure into an error status for API clients.
+    
+    Raises:
+        RequestError: 404 or 502 when the upstream API fails, 404 when a
+            bundled season has no such round
+    """
+    bundle = load_season_bundle(year)
+    if bundle is None:
+        try:
+            fetch_all(kind_endpoint(year, kind, rnd))
+        except APIError as e:
+            raise RequestError(404 if e.status_code == 404 else 502, str(e))
+        except Exception as e:
+            raise RequestError(502, f"Connection error: {e}")
+    elif (kind, rnd) not in bundle[1]:
+        # Bundles hold every round of a completed season, so upstream has nothing more
+        raise RequestError(404, f"No frame at {year}/{rnd}/{kind}" if rnd is not None else f"No frame at {year}/{kind}")
+    
+    if rnd is None:
+        return parsers.SEASON_PARSERS[kind](year)
+    df = parsers.ROUND_PARSERS[kind](year, rnd)
+    # Filter the whole race's laps, which the dashboard's lap charts have cached already
+    if driver_id and not df.empty:
+        df = df[df['DriverID'] == driver_id].reset_index(drop=True)
+    return df
+
+class DataAPIHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        try:
+            if parts.path.rstrip('/') == '/stats':
+                body = json.dumps({'http': http.get_stats(), 'memory': memory_usage()}).encode()
+                return self._send(200, CONTENT_TYPES['json'], body)
+            
+            fmt = negotiate(query, self.headers.get('Accept'))
+            year, rnd, kind = route(parts.path)
+            driver_id = query.get('driver', [None])[0] if kind == 'laps' else None
+            
+            # Bundled frames are already Arrow IPC streams: send them without decoding
+            if fmt == 'arrow' and driver_id is None:
+                payload = bundled_payload(year, kind, rnd)
+                if payload is not None:
+                    return self._send(200, CONTENT_TYPES['arrow'], memoryview(payload))
+            
+            body = encode(load(year, kind, rnd, driver_id), fmt)
+            self._send(200, CONTENT_TYPES[fmt], body)
+        except RequestError as e:
+            self._send(e.status, CONTENT_TYPES['json'], json.dumps({'error': str(e)}).encode())
+        except Exception:
+            logger.exception("Failed to serve %s", self.path)
+            self._send(500, CONTENT_TYPES['json'], json.dumps({'error': "Internal server error"}).encode())
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve parsed F1 frames over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    
+    server = ThreadingHTTPServer((args.host, args.port), DataAPIHandler)
+    print(f"Serving parsed frames on http://{args.host}:{args.port}")
+    server.serve_forever()
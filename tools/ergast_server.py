@@ -0,0 +1,177 @@
+"""
+Offline stand-in for the Ergast API, replaying recorded responses
+
+Record fixtures once from the live API (or the persistent cache):
+
+    python -m tools.ergast_server record --out fixtures 2019 2020
+
+then serve them and point the app at the server, ideally with a separate
+cache directory so benchmark runs start cold and never mix with real data.
+The client-side rate limit is sized for jolpi.ca and applies to whatever
+F1_API_BASE_URL points at, so lift it as well, or every benchmark measures
+the limiter (4 requests/s, 500/h) instead of the app:
+
+    python -m tools.ergast_server serve --fixtures fixtures --port 8000 --latency 0.05 --error-rate 0.02
+    F1_API_BASE_URL=http://127.0.0.1:8000 F1_CACHE_DIR=/tmp/f1-bench \\
+        F1_RATE_LIMIT_PER_SECOND=1000 F1_RATE_LIMIT_BURST=1000 F1_RATE_LIMIT_PER_HOUR=10000000 \\
+        streamlit run app.py
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Lists whose entries are paginated one by one, and lists that only group them
+ROW_LISTS = ('Timings', 'Results', 'QualifyingResults', 'SprintResults', 'PitStops', 'DriverStandings', 'ConstructorStandings')
+GROUP_LISTS = ('Races', 'Laps', 'StandingsLists')
+
+def _take(items, start, stop, pos):
+    """
+    Keep the rows in [start, stop) of a nested Ergast list, preserving its groups
+    
+    Returns:
+        Tuple of (sliced list, position after the last row seen)
+    """
+    kept = []
+    for item in items:
+        child_key = next((k for k in ROW_LISTS + GROUP_LISTS if isinstance(item.get(k), list)), None)
+        if child_key is None:
+            if start <= pos < stop:
+                kept.append(item)
+            pos += 1
+        else:
+            children, pos = _take(item[child_key], start, stop, pos)
+            if children:
+                kept.append(dict(item, **{child_key: children}))
+    return kept, pos
+
+def paginate(payload, limit, offset):
+    """
+    Cut one page out of a full recorded response, the way Ergast counts rows
+    
+    Args:
+        payload: Full (unpaginated) JSON response
+        limit: Page size
+        offset: Index of the first row
+        
+    Returns:
+        JSON response for the requested page
+    """
+    mr = dict(payload['MRData'])
+    table_key = next((k for k in mr if k.endswith('Table')), None)
+    if table_key is None:
+        return payload
+    table = dict(mr[table_key])
+    list_key = next((k for k, v in table.items() if isinstance(v, list)), None)
+    if list_key is None:
+        return payload
+    
+    _, total = _take(table[list_key], 0, 0, 0)
+    table[list_key], _ = _take(table[list_key], offset, offset + limit, 0)
+    mr[table_key] = table
+    mr.update({'limit': str(limit), 'offset': str(offset), 'total': str(total)})
+    return {'MRData': mr}
+
+def fixture_path(fixtures, endpoint):
+    """
+    File a recorded endpoint lives in, e.g. fixtures/2020/1/results.json
+    """
+    return os.path.join(fixtures, *endpoint.strip('/').split('/'))
+
+def make_handler(fixtures, latency, jitter, error_rate, error_status, max_limit, seed):
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    
+    class ErgastHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query)
+            endpoint = parts.path
+            if endpoint.startswith('/ergast/f1/'):
+                endpoint = endpoint[len('/ergast/f1'):]
+            
+            with rng_lock:
+                delay = latency + rng.uniform(-jitter, jitter) if jitter else latency
+                fail = rng.random() < error_rate
+            if delay > 0:
+                time.sleep(delay)
+            if fail:
+                return self._send(error_status, {'error': 'injected failure'})
+            
+            path = fixture_path(fixtures, endpoint)
+            if not os.path.isfile(path):
+                return self._send(404, {'error': f'no fixture for {endpoint}'})
+            with open(path) as f:
+                payload = json.load(f)
+            
+            limit = min(int(query.get('limit', ['30'])[0]), max_limit)
+            offset = int(query.get('offset', ['0'])[0])
+            self._send(200, paginate(payload, limit, offset))
+        
+        def _send(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return ErgastHandler
+
+def serve(args):
+    handler = make_handler(
+        args.fixtures, args.latency, args.jitter, args.error_rate, args.error_status, args.max_limit, args.seed
+    )
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"Serving {args.fixtures} on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+def record(args):
+    from utils.api import fetch_all
+    from utils.bundle import ROUND_KINDS, kind_endpoint, season_endpoints
+    
+    for year in args.years:
+        races = fetch_all(f"{year}/races.json")['MRData']['RaceTable']['Races']
+        rounds = [race['round'] for race in races]
+        endpoints = season_endpoints(year, rounds)
+        # build_season_bundle probes the last round of kinds the season is not expected to have
+        if rounds:
+            probes = [kind_endpoint(year, kind, rounds[-1]) for kind in ROUND_KINDS]
+            endpoints += [endpoint for endpoint in probes if endpoint not in endpoints]
+        for endpoint in endpoints:
+            path = fixture_path(args.out, endpoint)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(fetch_all(endpoint), f)
+        print(f"{year}: recorded {len(endpoints)} endpoints")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline Ergast stand-in server")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    serve_parser = sub.add_parser("serve", help="Replay recorded fixtures over HTTP")
+    serve_parser.add_argument("--fixtures", default="fixtures")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    serve_parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds around --latency")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    serve_parser.add_argument("--error-status", type=int, default=503)
+    serve_parser.add_argument("--max-limit", type=int, default=100, help="Largest page size honoured")
+    serve_parser.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and injected errors")
+    serve_parser.set_defaults(func=serve)
+    
+    record_parser = sub.add_parser("record", help="Record fixtures for whole seasons")
+    record_parser.add_argument("--out", default="fixtures")
+    record_parser.add_argument("years", nargs="+", type=int)
+    record_parser.set_defaults(func=record)
+    
+    args = parser.parse_args()
+    args.func(args)
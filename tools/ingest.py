@@ -0,0 +1,49 @@
+"""
+Bulk historical ingestion: every completed season since FIRST_SEASON into season bundles
+
+Each season is downloaded on a bounded thread pool, checked, and written to
+an Arrow bundle under CACHE_DIR, from which the dashboard then reads it
+without any request. Seasons that already have a bundle are skipped and
+finished tasks are checkpointed, so an interrupted run resumes where it
+stopped:
+
+    python -m tools.ingest --workers 4
+    python -m tools.ingest --start 1950 --end 1979
+
+Kinds the API only has from a later season on (laps, pit stops, sprints)
+are bundled empty for earlier seasons without being requested. At the
+API's 500 requests per hour a full run takes many hours; re-running it
+after an interruption only fetches what is missing.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from tools.warmup import Checkpoint, Progress, summary, warm_seasons
+from utils.bundle import SEASON_KINDS, ROUND_KINDS
+from utils.config import CACHE_DIR, FIRST_SEASON
+
+CHECKPOINT_PATH = os.path.join(CACHE_DIR, "ingest.checkpoint")
+
+if __name__ == "__main__":
+    last_completed = datetime.now().year - 1
+    parser = argparse.ArgumentParser(description="Ingest completed seasons into local season bundles")
+    parser.add_argument("--start", type=int, default=FIRST_SEASON, help="First season")
+    parser.add_argument("--end", type=int, default=last_completed, help="Last season (inclusive)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent tasks")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--progress-every", type=int, default=100, help="Print progress every N tasks")
+    args = parser.parse_args()
+    
+    years = list(range(args.start, min(args.end, last_completed) + 1))
+    if not years:
+        parser.error("no completed seasons between --start and --end")
+    
+    progress = Progress(args.progress_every)
+    incomplete = warm_seasons(
+        years, SEASON_KINDS + ROUND_KINDS, args.workers, Checkpoint(args.checkpoint), progress, bundle=True
+    )
+    print(summary(progress, years))
+    if incomplete:
+        print(f"Incomplete seasons (re-run to resume): {', '.join(map(str, incomplete))}")
+        sys.exit(1)
@@ -0,0 +1,263 @@
+"""
+Warm the persistent response cache for a range of seasons
+
+Every endpoint the dashboard reads is fetched and run through utils.parsers,
+so responses land in the persistent cache (and parsed frames in the shared
+frame cache, when one is configured). Bake a warm cache into an image or run
+it as a nightly job:
+
+    python -m tools.warmup --start 2000 --workers 4
+    python -m tools.warmup --start 2018 --end 2020 --kinds results,qualifying --bundle
+
+Finished work on completed seasons is appended to a checkpoint file, so an
+interrupted run resumes where it stopped. The current season is always
+re-run; that is cheap while its cached responses are still fresh.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from utils import cache, http, parsers
+from utils.api import fetch_all, prime_rounds
+from utils.bundle import SEASON_KINDS, ROUND_KINDS, bundle_path, build_season_bundle, has_data, kind_endpoint
+from utils.config import CACHE_DIR, FIRST_SEASON
+
+CHECKPOINT_PATH = os.path.join(CACHE_DIR, "warmup.checkpoint")
+
+class Checkpoint:
+    """
+    Keys of finished tasks, stored one per line in an append-only file
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self._done = {line.strip() for line in f if line.strip()}
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._done
+
+    def add(self, key):
+        with self._lock:
+            if key in self._done:
+                return
+            self._done.add(key)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(key + "\n")
+
+class Progress:
+    """
+    Thread-safe task counters with a periodic progress line
+    """
+    def __init__(self, every):
+        self.every = every
+        self.started = time.monotonic()
+        self.counts = {'done': 0, 'skipped': 0, 'failed': 0}
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def add_total(self, n):
+        with self._lock:
+            self.total += n
+
+    def record(self, outcome, key, error=None):
+        with self._lock:
+            self.counts[outcome] += 1
+            finished = sum(self.counts.values())
+            show = error is not None or finished % self.every == 0 or finished == self.total
+            line = f"[{finished}/{self.total}] {key}: {error}" if error is not None else \
+                f"[{finished}/{self.total}] {finished / self.elapsed():.1f} tasks/s, " \
+                f"{http.get_stats()['requests']} requests"
+        if show:
+            print(line, flush=True)
+
+    def elapsed(self):
+        return max(time.monotonic() - self.started, 1e-9)
+
+def _warm(year, kind, rnd=None):
+    """
+    Fetch one endpoint into the persistent cache, then parse it
+    
+    fetch_all raises on failure, unlike the parsers, which report errors and
+    return an empty frame; parsing afterwards reads from the cache.
+    """
+    fetch_all(kind_endpoint(year, kind, rnd))
+    if rnd is None:
+        parsers.SEASON_PARSERS[kind](year)
+    else:
+        parsers.ROUND_PARSERS[kind](year, rnd)
+
+def _task_key(year, kind, rnd=None):
+    return f"{year}/{kind}" if rnd is None else f"{year}/{rnd}/{kind}"
+
+def _rounds(year):
+    """
+    Round numbers worth warming: every round of a past season, the completed ones of the current
+    """
+    fetch_all(kind_endpoint(year, 'races'))
+    races = parsers.parse_races(year)
+    if races.empty:
+        return []
+    if year >= datetime.now().year:
+        races = races[races['completed']]
+    return [int(rnd) for rnd in races['round']]
+
+# Per-round kinds the API can also return for a whole season in one paginated query
+SEASON_WIDE_KINDS = ('results', 'qualifying', 'sprint')
+
+def _calendar(year, round_kinds):
+    """
+    Rounds of a season, after priming per-round responses from season-wide queries
+    
+    Only completed seasons are primed; their responses never change.
+    """
+    rounds = _rounds(year)
+    if year < datetime.now().year:
+        for kind in SEASON_WIDE_KINDS:
+            if kind in round_kinds and has_data(year, kind):
+                try:
+                    prime_rounds(year, kind, rounds)
+                except Exception as e:
+                    # The per-round tasks fetch whatever is still missing
+                    print(f"{year}/{kind}: season-wide fetch failed ({e}), falling back to rounds", flush=True)
+    return rounds
+
+def _run_task(checkpoint, progress, final, year, kind, rnd=None):
+    key = _task_key(year, kind, rnd)
+    if key in checkpoint:
+        progress.record('skipped', key)
+        return True
+    try:
+        _warm(year, kind, rnd)
+    except Exception as e:
+        progress.record('failed', key, error=e)
+        return False
+    if final:
+        checkpoint.add(key)
+    progress.record('done', key)
+    return True
+
+def warm_seasons(years, kinds, workers, checkpoint, progress, bundle=False):
+    """
+    Warm every selected kind for each season on a bounded thread pool
+    
+    Args:
+        years: Seasons to warm
+        kinds: Kinds from SEASON_KINDS and ROUND_KINDS
+        workers: Number of concurrent tasks
+        checkpoint: Checkpoint of finished tasks
+        progress: Progress counters
+        bundle: Also build a season bundle for each fully warmed past season
+    
+    Returns:
+        List of seasons that could not be warmed completely
+    """
+    current = datetime.now().year
+    season_kinds = [k for k in SEASON_KINDS if k in kinds and k != 'races']
+    round_kinds = [k for k in ROUND_KINDS if k in kinds]
+    pending = []
+    for year in years:
+        # The checkpoint only records warmed seasons; with bundle, a season is done once its bundle exists
+        if os.path.exists(bundle_path(year)):
+            print(f"{year}: already bundled, skipping", flush=True)
+        elif not bundle and str(year) in checkpoint:
+            print(f"{year}: already warm, skipping", flush=True)
+        else:
+            pending.append(year)
+    
+    incomplete = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="f1-warmup") as pool:
+        # The calendar comes first: it decides which per-round tasks exist
+        progress.add_total(len(pending))
+        calendars = {pool.submit(_calendar, year, round_kinds): year for year in pending}
+        tasks = {}
+        for future in as_completed(calendars):
+            year = calendars[future]
+            final = year < current
+            try:
+                rounds = future.result()
+            except Exception as e:
+                progress.record('failed', _task_key(year, 'races'), error=e)
+                incomplete.add(year)
+                continue
+            progress.record('done', _task_key(year, 'races'))
+            
+            jobs = [(year, kind) for kind in season_kinds]
+            jobs += [(year, kind, rnd) for rnd in rounds for kind in round_kinds if has_data(year, kind)]
+            progress.add_total(len(jobs))
+            for job in jobs:
+                tasks[pool.submit(_run_task, checkpoint, progress, final, *job)] = year
+        
+        for future in as_completed(tasks):
+            if not future.result():
+                incomplete.add(tasks[future])
+    
+    for year in pending:
+        if year in incomplete or year >= current:
+            continue
+        if bundle:
+            try:
+                print(f"{year}: bundled to {build_season_bundle(year)}", flush=True)
+            except Exception as e:
+                print(f"{year}: bundle failed: {e}", flush=True)
+                incomplete.add(year)
+                continue
+        if set(kinds) >= set(SEASON_KINDS + ROUND_KINDS):
+            checkpoint.add(str(year))
+    
+    return sorted(incomplete)
+
+def summary(progress, years):
+    """
+    Format the end-of-run totals: tasks, throughput and HTTP client activity
+    """
+    elapsed = progress.elapsed()
+    finished = sum(progress.counts.values())
+    stats = http.get_stats()
+    cache_mb = sum(os.path.getsize(p) for p in (cache.DB_PATH, f"{cache.DB_PATH}-wal") if os.path.exists(p)) / 1e6
+    return "\n".join([
+        f"Warmed {years[0]}-{years[-1]}: {finished} tasks "
+        f"({progress.counts['done']} done, {progress.counts['skipped']} skipped, {progress.counts['failed']} failed) "
+        f"in {elapsed:.1f}s",
+        f"  {finished / elapsed:.1f} tasks/s, {stats['requests']} requests ({stats['requests'] / elapsed:.1f}/s), "
+        f"{stats['retried']} retried, {stats['throttled']} throttled for {stats['throttle_wait']:.1f}s",
+        f"  Persistent cache: {cache_mb:.1f} MB at {cache.DB_PATH}",
+    ])
+
+if __name__ == "__main__":
+    now = datetime.now().year
+    parser = argparse.ArgumentParser(description="Warm the persistent cache for a range of seasons")
+    parser.add_argument("--start", type=int, default=FIRST_SEASON, help="First season")
+    parser.add_argument("--end", type=int, default=now, help="Last season (inclusive)")
+    parser.add_argument("--kinds", default=",".join(SEASON_KINDS + ROUND_KINDS),
+                        help="Comma-separated kinds to warm; races are always fetched")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent tasks")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--fresh", action="store_true", help="Ignore the checkpoint from earlier runs")
+    parser.add_argument("--bundle", action="store_true", help="Build a season bundle for each warmed past season")
+    parser.add_argument("--progress-every", type=int, default=25, help="Print progress every N tasks")
+    args = parser.parse_args()
+    
+    kinds = tuple(k.strip() for k in args.kinds.split(",") if k.strip())
+    unknown = set(kinds) - set(SEASON_KINDS + ROUND_KINDS)
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+    
+    if args.fresh and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    years = list(range(args.start, min(args.end, now) + 1))
+    if not years:
+        parser.error("no seasons between --start and --end")
+    progress = Progress(args.progress_every)
+    incomplete = warm_seasons(years, kinds, args.workers, Checkpoint(args.checkpoint), progress, args.bundle)
+    print(summary(progress, years))
+    if incomplete:
+        print(f"Incomplete seasons (re-run to resume): {', '.join(map(str, incomplete))}")
+        sys.exit(1)
@@ -1,26 +1,332 @@
-import streamlit as st
-import requests
+import copy
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from utils import cache, http, schedule
+from utils.config import API_BASE_URL, PAGE_LIMIT, PAGE_WORKERS, REFRESH_WORKERS
 
-@st.cache_data(ttl=3600)
-def get_f1_data(endpoint):
+class APIError(Exception):
+    """
+    Raised when the API answers with a non-200 status
     """
-    Base API call function with loading indicator
+    
+    def __init__(self, status_code, endpoint):
+        super().__init__(f"API error {status_code}: Could not fetch data from {endpoint}")
+        self.status_code = status_code
+        self.endpoint = endpoint
+
+logger = logging.getLogger(__name__)
+
+def _log_error(message):
+    logger.error(message)
+
+# How get_f1_data_paginated reports failures; the UI installs st.error
+_report_error = _log_error
+
+def set_error_handler(handler):
+    """
+    Replace how fetch errors are reported (None restores logging)
     
     Args:
-        endpoint: The API endpoint to fetch data from
+        handler: Callable taking the error message
+    """
+    global _report_error
+    _report_error = handler or _log_error
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def single_flight(key, func):
+    """
+    Run func once for all concurrent callers using the same key
+    
+    The first caller runs func; callers arriving while it is in flight wait
+    for it and receive the same result (or exception). Results are shared
+    objects and must be treated as read-only.
+    
+    Args:
+        key: Hashable identity of the work, e.g. the endpoint
+        func: Zero-argument callable doing the work
         
     Returns:
-        JSON response from the API or None if error
+        The result of func
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+    if not leader:
+        try:
+            return future.result()
+        except http.RateLimited:
+            # A dropped background fetch must not fail a caller that may wait
+            if http.in_background():
+                raise
+            return single_flight(key, func)
+    
+    try:
+        result = func()
+    except BaseException as e:
+        # Unregister first, so a caller retrying after the error starts a new flight
+        with _inflight_lock:
+            del _inflight[key]
+        future.set_exception(e)
+        raise
+    with _inflight_lock:
+        del _inflight[key]
+    future.set_result(result)
+    return result
+
+def _expiry(endpoint):
+    """
+    When a response fetched now should be refetched, based on the race calendar
+    """
+    now = time.time()
+    calendar = None
+    if schedule.needs_calendar(endpoint, now):
+        try:
+            calendar = schedule.race_times(fetch_all(f"{schedule.endpoint_season(endpoint)}/races.json"))
+        except Exception:
+            # Fall back to the fixed current-season TTL
+            calendar = None
+    return schedule.expiry_for(endpoint, now, calendar)
+
+def _request(endpoint):
+    resp = http.get(f"{API_BASE_URL}/{endpoint}")
+    if resp.status_code != 200:
+        raise APIError(resp.status_code, endpoint)
+    return resp.json()
+
+def _download(endpoint):
+    # Another caller may have stored the response between our cache miss and
+    # becoming the leader, so look again before going upstream
+    cached = cache.load(endpoint)
+    if cached is not None:
+        return cached
+    
+    data = _request(endpoint)
+    cache.store(endpoint, data, _expiry(endpoint))
+    return data
+
+_refresher = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="f1-refresh")
+_refreshing = set()
+
+def _revalidate_pages(endpoint):
+    """
+    Refetch every page of an endpoint and replace the cached page set in one transaction
     """
-    BASE_URL = "http://api.jolpi.ca/ergast/f1"
-    url = f"{BASE_URL}/{endpoint}"
+    first_page = page_endpoint(endpoint, PAGE_LIMIT, 0)
+    first = _request(first_page)
+    mr = first.get('MRData', {})
+    total = int(mr.get('total', 0))
+    limit = int(mr.get('limit', PAGE_LIMIT)) or PAGE_LIMIT
+    pages = [(first_page, first)]
+    if total > limit:
+        rest = [page_endpoint(endpoint, limit, offset) for offset in range(limit, total, limit)]
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+            pages += zip(rest, pool.map(_request, rest))
+    expires_at = _expiry(first_page)
+    cache.store_many([(page, data, expires_at) for page, data in pages])
+
+def _refresh(endpoint):
     try:
-        resp = requests.get(url)
-        if resp.status_code == 200:
-            return resp.json()
+        _revalidate_pages(endpoint)
+    except Exception:
+        # Keep serving the stale pages; the next stale read retries
+        pass
+    finally:
+        with _inflight_lock:
+            _refreshing.discard(endpoint)
+
+def revalidate_in_background(endpoint):
+    """
+    Schedule a refetch of all pages of a paginated endpoint on the background worker pool
+    
+    The old pages keep being served until every new page has arrived, so
+    readers never merge pages from two different versions of the data.
+    
+    Args:
+        endpoint: The API endpoint (without limit/offset) to refresh
+    """
+    with _inflight_lock:
+        if endpoint in _refreshing:
+            return
+        _refreshing.add(endpoint)
+    _refresher.submit(_refresh, endpoint)
+
+def page_endpoint(endpoint, limit, offset):
+    """
+    Add limit/offset query parameters to an endpoint
+    """
+    sep = '&' if '?' in endpoint else '?'
+    return f"{endpoint}{sep}limit={limit}&offset={offset}"
+
+def _item_key(item):
+    # Entries that can be split across pages and must be joined back together:
+    # a lap's Timings, and a race's or standings list's inner results
+    if 'Timings' in item and 'number' in item:
+        return ('lap', item['number'])
+    if 'round' in item:
+        return ('round', item.get('season'), item['round'])
+    return None
+
+def _merge_lists(dst, src):
+    index = {}
+    for item in dst:
+        if isinstance(item, dict) and _item_key(item) is not None:
+            index[_item_key(item)] = item
+    for item in src:
+        key = _item_key(item) if isinstance(item, dict) else None
+        if key is not None and key in index:
+            _merge_dicts(index[key], item)
         else:
-            st.error(f"API error {resp.status_code}: Could not fetch data from {endpoint}")
-            return None
+            dst.append(item)
+            if key is not None:
+                index[key] = item
+
+def _merge_dicts(dst, src):
+    for key, value in src.items():
+        if isinstance(value, list) and isinstance(dst.get(key), list):
+            _merge_lists(dst[key], value)
+        elif isinstance(value, dict) and isinstance(dst.get(key), dict):
+            _merge_dicts(dst[key], value)
+        elif key not in dst:
+            dst[key] = value
+
+def merge_pages(pages):
+    """
+    Merge paginated API responses into a single response
+    
+    Races, standings lists and laps that straddle a page boundary are joined,
+    so the result has the same structure as an unpaginated response.
+    
+    Args:
+        pages: List of JSON responses in offset order
+        
+    Returns:
+        A single JSON response covering every page
+    """
+    merged = copy.deepcopy(pages[0])
+    for page in pages[1:]:
+        _merge_dicts(merged['MRData'], page['MRData'])
+    mr = merged['MRData']
+    mr['limit'] = mr.get('total', mr.get('limit'))
+    mr['offset'] = '0'
+    return merged
+
+def fetch_all(endpoint):
+    """
+    Fetch every page of an endpoint, without any UI side effects
+    
+    The first page is requested with the largest allowed page size; once
+    MRData.total is known the remaining pages are fetched concurrently.
+    Concurrent callers for the same endpoint share one fetch and merge. If
+    any cached page has expired, the stale set is served while a background
+    worker refetches all pages together (see revalidate_in_background).
+    
+    Args:
+        endpoint: The API endpoint to fetch data from
+        
+    Returns:
+        JSON response covering all pages
+        
+    Raises:
+        APIError: If any page answers with a non-200 status
+        requests.RequestException: If the API cannot be reached
+    """
+    return single_flight(('all', endpoint), lambda: _fetch_pages(endpoint))
+
+def _page(endpoint):
+    """
+    Read one page through the persistent cache, leaving stale pages for the caller to revalidate
+    
+    Returns:
+        Tuple of (JSON response, is_fresh)
+    """
+    cached, fresh = cache.lookup(endpoint)
+    if cached is not None:
+        return cached, fresh
+    return single_flight(('json', endpoint), lambda: _download(endpoint)), True
+
+def _fetch_pages(endpoint):
+    first, fresh = _page(page_endpoint(endpoint, PAGE_LIMIT, 0))
+    mr = first.get('MRData', {})
+    total = int(mr.get('total', 0))
+    # The server may clamp the page size, so page with the limit it actually used
+    limit = int(mr.get('limit', PAGE_LIMIT)) or PAGE_LIMIT
+    if total <= limit:
+        if not fresh:
+            revalidate_in_background(endpoint)
+        return first
+    
+    offsets = range(limit, total, limit)
+    mode = http.in_background()
+    
+    def fetch_page(offset):
+        # Page workers inherit whether the caller runs as background work
+        with http.background(mode):
+            return _page(page_endpoint(endpoint, limit, offset))
+    
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+        rest = list(pool.map(fetch_page, offsets))
+    if not (fresh and all(page_fresh for _, page_fresh in rest)):
+        revalidate_in_background(endpoint)
+    return merge_pages([first] + [page for page, _ in rest])
+
+def prime_rounds(year, name, rounds):
+    """
+    Fill the per-round cache entries of a season from one season-wide query
+    
+    "{year}/{name}.json" returns every race of the season in a few pages. Each
+    round is stored in the persistent cache as the single page its
+    "{year}/{round}/{name}.json" endpoint would have returned (with no races
+    for rounds missing from the season-wide answer), so later per-round
+    fetches are cache hits instead of one request per round.
+    
+    Args:
+        year: The season
+        name: Per-round endpoint name with a season-wide form
+            ("results", "qualifying" or "sprint")
+        rounds: Round numbers of the season
+        
+    Returns:
+        Number of rounds stored
+    """
+    data = fetch_all(f"{year}/{name}.json")
+    mr = data['MRData']
+    table_key = next(k for k in mr if k.endswith('Table'))
+    races = {str(race['round']): race for race in mr[table_key].get('Races', [])}
+    primed = 0
+    for rnd in map(str, rounds):
+        race = races.get(rnd)
+        rows = sum(len(v) for v in race.values() if isinstance(v, list)) if race else 0
+        page = page_endpoint(f"{year}/{rnd}/{name}.json", PAGE_LIMIT, 0)
+        if rows > PAGE_LIMIT or cache.expiry(page)[0]:
+            continue
+        table = dict(mr[table_key], round=rnd, Races=[race] if race else [])
+        body = dict(mr, limit=str(PAGE_LIMIT), offset='0', total=str(rows), **{table_key: table})
+        cache.store(page, {'MRData': body}, _expiry(page))
+        primed += 1
+    return primed
+
+def get_f1_data_paginated(endpoint):
+    """
+    API call that transparently follows Ergast pagination
+    
+    Args:
+        endpoint: The API endpoint to fetch data from
+        
+    Returns:
+        JSON response covering all pages or None if error
+    """
+    try:
+        return fetch_all(endpoint)
+    except APIError as e:
+        _report_error(str(e))
+        return None
     except Exception as e:
-        st.error(f"Connection error: {str(e)}")
-        return None
\ No newline at end of file
+        _report_error(f"Connection error: {str(e)}")
+        return None
@@ -0,0 +1,41 @@
+import pandas as pd
+import pyarrow as pa
+
+# Bump whenever the parsers' output changes, so stored frames in an older layout are ignored
+FRAME_VERSION = 3
+
+def frame_to_ipc(df):
+    """
+    Serialize a DataFrame as an Arrow IPC stream
+    
+    Dtypes (categoricals, small integers, datetimes) survive the round trip
+    through the pandas metadata Arrow stores with the schema.
+    
+    Args:
+        df: DataFrame to serialize
+        
+    Returns:
+        bytes of the IPC stream (empty for an empty DataFrame)
+    """
+    if df.empty:
+        return b""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def frame_from_ipc(payload):
+    """
+    Read a DataFrame back from an Arrow IPC stream
+    
+    Args:
+        payload: bytes or pyarrow Buffer written by frame_to_ipc; buffers are
+            read without copying
+        
+    Returns:
+        DataFrame
+    """
+    if payload is None or len(payload) == 0:
+        return pd.DataFrame()
+    return pa.ipc.open_stream(pa.py_buffer(payload)).read_all().to_pandas()
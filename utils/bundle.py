@@ -0,0 +1,217 @@
+import argparse
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pyarrow as pa
+from utils.api import fetch_all
+from utils.arrow import FRAME_VERSION, frame_to_ipc, frame_from_ipc
+from utils.config import CACHE_DIR, PAGE_WORKERS
+
+BUNDLE_DIR = os.path.join(CACHE_DIR, "bundles", f"v{FRAME_VERSION}")
+
+# Bundle schema: one row per (kind, round), each payload an Arrow IPC stream of a parsed frame
+SCHEMA = pa.schema([
+    ('kind', pa.string()),
+    ('round', pa.int16()),
+    ('payload', pa.binary()),
+])
+
+SEASON_KINDS = ('races', 'driver_standings', 'constructor_standings')
+ROUND_KINDS = ('results', 'qualifying', 'sprint', 'pitstops', 'laps')
+
+# Endpoint behind each season-level kind; per-round kinds are "{year}/{round}/{kind}.json"
+SEASON_ENDPOINTS = {
+    'races': "{year}/races.json",
+    'driver_standings': "{year}/driverStandings.json",
+    'constructor_standings': "{year}/constructorStandings.json",
+}
+
+# First season the API is expected to have data for, for kinds that start later than 1950.
+# Only a hint to save requests: a season is bundled with empty frames of a kind once the
+# API itself reported no data for it, and bundled seasons answer has_data from their contents.
+KIND_FIRST_SEASON = {'laps': 1996, 'pitstops': 2012, 'sprint': 2021}
+
+_bundles = {}
+_lock = threading.Lock()
+
+def bundle_path(year):
+    """
+    Location of the bundle file for a season
+    """
+    return os.path.join(BUNDLE_DIR, f"{year}.arrow")
+
+def kind_endpoint(year, kind, rnd=None):
+    """
+    API endpoint a parsed frame of the given kind is built from
+    
+    Args:
+        year: The season
+        kind: One of SEASON_KINDS or ROUND_KINDS
+        rnd: The round number for per-round kinds
+        
+    Returns:
+        API endpoint
+    """
+    if rnd is None:
+        return SEASON_ENDPOINTS[kind].format(year=year)
+    return f"{year}/{rnd}/{kind}.json"
+
+def has_data(year, kind):
+    """
+    Whether the API has any data of this kind for a season
+    
+    Bundled seasons answer from the frames they hold; for other seasons
+    KIND_FIRST_SEASON is used as a hint, without any request.
+    """
+    bundle = load_season_bundle(year)
+    if bundle is not None:
+        payloads, index = bundle
+        return any(payloads[row].as_buffer().size for (k, _), row in index.items() if k == kind)
+    return year >= KIND_FIRST_SEASON.get(kind, 0)
+
+def _probe(year, kind, rounds):
+    """
+    Ask the API whether a season has data of a kind, from MRData.total of its last round
+    """
+    data = fetch_all(kind_endpoint(year, kind, rounds[-1]))
+    return int(data['MRData'].get('total', 0)) > 0
+
+def season_endpoints(year, rounds, kinds=None):
+    """
+    Every endpoint whose data goes into a season bundle
+    
+    Args:
+        year: The season
+        rounds: Round numbers of the season
+        kinds: Per-round kinds to include (by default those has_data expects)
+        
+    Returns:
+        List of API endpoints
+    """
+    if kinds is None:
+        kinds = [kind for kind in ROUND_KINDS if has_data(year, kind)]
+    endpoints = [kind_endpoint(year, kind) for kind in SEASON_KINDS]
+    for rnd in rounds:
+        endpoints += [kind_endpoint(year, kind, rnd) for kind in kinds]
+    return endpoints
+
+def build_season_bundle(year):
+    """
+    Write a completed season into a single Arrow bundle file
+    
+    Every endpoint is downloaded (or read from the persistent cache) first, so
+    a failed request aborts the build instead of being stored as "no data".
+    Kinds KIND_FIRST_SEASON does not expect for the season are probed with
+    one request first; they are stored as empty frames only if the API
+    confirms it has none.
+    
+    Args:
+        year: A completed season
+        
+    Returns:
+        Path of the written bundle
+    """
+    from utils import parsers
+    
+    if year >= datetime.now().year:
+        raise ValueError(f"Season {year} is not completed yet and cannot be bundled")
+    
+    fetch_all(f"{year}/races.json")
+    races = parsers.parse_races(year)
+    rounds = [int(r) for r in races['round']] if not races.empty else []
+    available = [
+        kind for kind in ROUND_KINDS
+        if rounds and (year >= KIND_FIRST_SEASON.get(kind, 0) or _probe(year, kind, rounds))
+    ]
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+        list(pool.map(fetch_all, season_endpoints(year, rounds, available)))
+    
+    kinds, round_col, payloads = [], [], []
+    for kind in SEASON_KINDS:
+        kinds.append(kind)
+        round_col.append(None)
+        payloads.append(frame_to_ipc(parsers.SEASON_PARSERS[kind](year)))
+    for rnd in rounds:
+        for kind in ROUND_KINDS:
+            kinds.append(kind)
+            round_col.append(rnd)
+            payloads.append(frame_to_ipc(parsers.ROUND_PARSERS[kind](year, rnd)) if kind in available else b"")
+    
+    table = pa.Table.from_arrays(
+        [pa.array(kinds, pa.string()), pa.array(round_col, pa.int16()), pa.array(payloads, pa.binary())],
+        schema=SCHEMA,
+    )
+    
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    path = bundle_path(year)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, SCHEMA) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    
+    with _lock:
+        _bundles.pop(year, None)
+    return path
+
+def load_season_bundle(year):
+    """
+    Memory-map a season bundle
+    
+    The file is opened once per process; payloads stay in the mapped file
+    until a frame is requested.
+    
+    Args:
+        year: The season
+        
+    Returns:
+        Tuple of (payload column, {(kind, round): row}) or None if no bundle exists
+    """
+    with _lock:
+        if year in _bundles:
+            return _bundles[year]
+    
+    path = bundle_path(year)
+    if not os.path.exists(path):
+        return None
+    
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    index = {
+        (kind, rnd): i
+        for i, (kind, rnd) in enumerate(zip(table.column('kind').to_pylist(), table.column('round').to_pylist()))
+    }
+    bundle = (table.column('payload'), index)
+    with _lock:
+        _bundles[year] = bundle
+    return bundle
+
+def load_frame(year, kind, rnd=None):
+    """
+    Read one parsed frame from a season bundle
+    
+    Args:
+        year: The season
+        kind: One of SEASON_KINDS or ROUND_KINDS
+        rnd: The round number for per-round kinds
+        
+    Returns:
+        DataFrame, or None if the season or round is not bundled
+    """
+    bundle = load_season_bundle(year)
+    if bundle is None:
+        return None
+    
+    payloads, index = bundle
+    row = index.get((kind, int(rnd) if rnd is not None else None))
+    if row is None:
+        return None
+    
+    return frame_from_ipc(payloads[row].as_buffer())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build season bundles for completed seasons")
+    parser.add_argument("years", nargs="+", type=int, help="Seasons to bundle")
+    args = parser.parse_args()
+    for year in args.years:
+        print(f"{year}: {build_season_bundle(year)}")
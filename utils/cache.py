@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from utils.config import CACHE_DIR, MAX_STALENESS
+
+DB_PATH = os.path.join(CACHE_DIR, "responses.sqlite3")
+
+_local = threading.local()
+
+def _connect():
+    """
+    Get this thread's connection to the response cache database
+    
+    Returns:
+        sqlite3 connection with the responses table created
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        # WAL lets readers in other threads/processes run while a response is written
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "endpoint TEXT PRIMARY KEY, "
+            "body TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL, "
+            "expires_at REAL)"
+        )
+        _local.conn = conn
+    return conn
+
+def lookup(endpoint):
+    """
+    Read a response from the persistent cache, allowing stale entries
+    
+    Args:
+        endpoint: The API endpoint to look up
+        
+    Returns:
+        Tuple of (decoded JSON response, is_fresh). The response is None if
+        missing, unreadable, or expired for longer than MAX_STALENESS.
+    """
+    try:
+        row = _connect().execute(
+            "SELECT body, expires_at FROM responses WHERE endpoint = ?", (endpoint,)
+        ).fetchone()
+    except sqlite3.Error:
+        return None, False
+    if row is None:
+        return None, False
+    body, expires_at = row
+    now = time.time()
+    if expires_at is None or expires_at > now:
+        return json.loads(body), True
+    if now - expires_at <= MAX_STALENESS:
+        return json.loads(body), False
+    return None, False
+
+def expiry(endpoint):
+    """
+    Look up when a cached response expires
+    
+    Args:
+        endpoint: The API endpoint to look up
+        
+    Returns:
+        Tuple of (found, expires_at); expires_at is None for responses that
+        never expire
+    """
+    try:
+        row = _connect().execute(
+            "SELECT expires_at FROM responses WHERE endpoint = ?", (endpoint,)
+        ).fetchone()
+    except sqlite3.Error:
+        return False, None
+    if row is None:
+        return False, None
+    return True, row[0]
+
+def load(endpoint):
+    """
+    Read a fresh response from the persistent cache
+    
+    Args:
+        endpoint: The API endpoint to look up
+        
+    Returns:
+        Decoded JSON response, or None if missing, expired or unreadable
+    """
+    data, fresh = lookup(endpoint)
+    return data if fresh else None
+
+def endpoints(pattern):
+    """
+    List cached endpoints matching a GLOB pattern
+    
+    Args:
+        pattern: SQLite GLOB pattern, e.g. "*/*/results.json*"
+        
+    Returns:
+        List of endpoints (empty if the cache cannot be read)
+    """
+    try:
+        rows = _connect().execute(
+            "SELECT endpoint FROM responses WHERE endpoint GLOB ?", (pattern,)
+        ).fetchall()
+    except sqlite3.Error:
+        return []
+    return [row[0] for row in rows]
+
+def store(endpoint, data, expires_at):
+    """
+    Write a response to the persistent cache
+    
+    The row is replaced in a single transaction, so readers see either the
+    old or the new response, never a mix.
+    
+    Args:
+        endpoint: The API endpoint the response came from
+        data: Decoded JSON response
+        expires_at: Unix timestamp the response goes stale, or None for never
+    """
+    store_many([(endpoint, data, expires_at)])
+
+def store_many(entries):
+    """
+    Write several responses to the persistent cache in one transaction
+    
+    Used to replace all pages of an endpoint at once, so readers never see
+    some pages of the old version next to pages of the new one.
+    
+    Args:
+        entries: Iterable of (endpoint, decoded JSON response, expires_at)
+    """
+    fetched_at = time.time()
+    rows = [
+        (endpoint, json.dumps(data, separators=(",", ":")), fetched_at, expires_at)
+        for endpoint, data, expires_at in entries
+    ]
+    try:
+        conn = _connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO responses (endpoint, body, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+    except sqlite3.Error:
+        # The cache is an optimisation; a read-only or full disk must not break the app
+        pass
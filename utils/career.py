@@ -0,0 +1,297 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from utils import cache, parsers
+from utils.arrow import FRAME_VERSION, frame_to_ipc, frame_from_ipc
+from utils.bundle import load_frame, load_season_bundle
+from utils.config import CACHE_DIR, FIRST_SEASON
+from utils.memo import frame_digest, memoize
+
+CAREER_DIR = os.path.join(CACHE_DIR, "career", f"v{FRAME_VERSION}")
+CAREER_DB = os.path.join(CAREER_DIR, "career.sqlite3")
+
+# Frames making up the materialized state, stored together in one transaction
+PARTS = ('rounds', 'contributions', 'drivers', 'constructors')
+
+# Counters summed per driver and constructor; Avg Finish is FinishSum / Starts
+METRICS = ['Starts', 'Wins', 'Podiums', 'Poles', 'Points', 'DNFs', 'FinishSum']
+
+# Statuses of classified finishers: "Finished", "+1 Lap", "+2 Laps", ... and "Lapped"
+CLASSIFIED = r'^(?:Finished|Lapped|\+\d+ Laps?)$'
+
+# (key column, name column) of each materialized table
+TABLES = {'drivers': ('DriverID', 'Driver'), 'constructors': ('ConstructorID', 'Constructor')}
+
+_lock = threading.Lock()
+_state = None
+
+def contributions(results, year, rnd):
+    """
+    Counters each result of a race adds to its driver's and constructor's career
+    
+    Args:
+        results: DataFrame from parse_results
+        year: The season
+        rnd: The round number
+    
+    Returns:
+        DataFrame with Year, Round, DriverID, ConstructorID, Driver,
+        Constructor and one column per METRICS entry
+    """
+    n = len(results)
+    position = results['Position'].to_numpy(dtype=np.int32)
+    classified = results['Status'].astype(str).str.match(CLASSIFIED).to_numpy()
+    return pd.DataFrame({
+        'Year': np.full(n, year, dtype=np.int16),
+        'Round': np.full(n, rnd, dtype=np.int16),
+        'DriverID': results['DriverID'].astype(str).to_numpy(),
+        'ConstructorID': results['ConstructorID'].astype(str).to_numpy(),
+        'Driver': results['Driver'].astype(str).to_numpy(),
+        'Constructor': results['Constructor'].astype(str).to_numpy(),
+        'Starts': np.ones(n, dtype=np.int32),
+        'Wins': (position == 1).astype(np.int32),
+        'Podiums': (position <= 3).astype(np.int32),
+        'Poles': (results['Grid'].to_numpy() == 1).astype(np.int32),
+        'Points': results['Points'].to_numpy(dtype=np.float64),
+        'DNFs': (~classified).astype(np.int32),
+        'FinishSum': position,
+    })
+
+def _totals(contrib, table):
+    """
+    Sum contributions per driver or constructor, keeping the latest name
+    """
+    key, name = TABLES[table]
+    if contrib.empty:
+        columns = {metric: pd.Series(dtype=np.float64) for metric in METRICS}
+        columns[name] = pd.Series(dtype=object)
+        return pd.DataFrame(columns, index=pd.Index([], name=key, dtype=object))
+    grouped = contrib.groupby(key, sort=False)
+    totals = grouped[METRICS].sum()
+    totals[name] = grouped[name].last()
+    return totals
+
+def _apply(totals, delta, table, sign):
+    """
+    Add (sign=1) or remove (sign=-1) a delta from a materialized table
+    """
+    _, name = TABLES[table]
+    if delta.empty:
+        return totals
+    combined = totals[METRICS].add(delta[METRICS] * sign, fill_value=0)
+    if sign > 0:
+        combined[name] = delta[name].combine_first(totals[name])
+    else:
+        combined[name] = totals[name].reindex(combined.index)
+    return combined[combined['Starts'] > 0]
+
+def _connect():
+    """
+    Open the career database, shared by every process using the same CACHE_DIR
+    """
+    os.makedirs(CAREER_DIR, exist_ok=True)
+    # Autocommit mode: update() opens its transaction explicitly with BEGIN IMMEDIATE
+    conn = sqlite3.connect(CAREER_DB, timeout=60, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS parts (name TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    return conn
+
+def _generation(conn):
+    """
+    Counter bumped by every saved update, so other processes' changes are noticed
+    """
+    row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    return row[0] if row else 0
+
+def _load(conn):
+    """
+    Read the materialized tables and their ledger from the database
+    
+    Returns:
+        Dictionary with 'rounds' (Year, Round, Digest of every applied round),
+        'contributions' (the ledger rows, needed to retract a changed round),
+        one totals table per TABLES entry and the 'generation' it was read at
+    """
+    stored = {
+        name: frame_from_ipc(payload)
+        for name, payload in conn.execute("SELECT name, payload FROM parts").fetchall()
+    }
+    state = {'generation': _generation(conn), 'contributions': stored.get('contributions', pd.DataFrame())}
+    rounds = stored.get('rounds')
+    state['rounds'] = rounds if rounds is not None and not rounds.empty else \
+        pd.DataFrame({'Year': [], 'Round': [], 'Digest': []})
+    for table, (key, _) in TABLES.items():
+        totals = stored.get(table)
+        state[table] = totals.set_index(key) if totals is not None and key in totals.columns else \
+            _totals(pd.DataFrame(), table)
+    return state
+
+def _save(conn, state):
+    """
+    Write every part of the state and bump the generation, inside the caller's transaction
+    """
+    frames = {'rounds': state['rounds'], 'contributions': state['contributions']}
+    frames.update({table: state[table].reset_index() for table in TABLES})
+    conn.executemany(
+        "INSERT OR REPLACE INTO parts (name, payload) VALUES (?, ?)",
+        [(part, frame_to_ipc(frames[part])) for part in PARTS],
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)", (state['generation'],)
+    )
+
+def available_rounds():
+    """
+    Every race whose results are stored locally, in a season bundle or the response cache
+    
+    Returns:
+        Sorted list of (year, round) tuples
+    """
+    found = set()
+    for year in range(FIRST_SEASON, datetime.now().year + 1):
+        bundle = load_season_bundle(year)
+        if bundle is not None:
+            payloads, index = bundle
+            found.update(
+                (year, rnd) for (kind, rnd), row in index.items()
+                if kind == 'results' and payloads[row].as_buffer().size
+            )
+    for endpoint in cache.endpoints("*/*/results.json?*offset=0"):
+        year, rnd = endpoint.split('/')[:2]
+        if year.isdigit() and rnd.isdigit():
+            found.add((int(year), int(rnd)))
+    return sorted(found)
+
+def _results(year, rnd):
+    # Bundled rounds are read directly so a full rebuild does not flood the memory cache
+    bundled = load_frame(year, 'results', rnd)
+    return bundled if bundled is not None else parsers.parse_results(year, rnd)
+
+def update():
+    """
+    Apply every new or changed round to the materialized career tables
+    
+    Completed seasons are only read once; rounds of the current season are
+    re-checked by content digest, so penalties applied after a race replace
+    that round's contribution. Only the delta of those rounds is added to
+    (or retracted from) the stored totals.
+    
+    The whole read-apply-write cycle runs in one database transaction that
+    locks out other processes, so the ledger and the totals are always saved
+    together, and state changed by another process is reloaded first.
+    
+    Returns:
+        Number of rounds applied
+    """
+    global _state
+    with _lock:
+        conn = _connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            state, changed = _update(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        _state = state
+        return changed
+
+def _update(conn):
+    """
+    Apply the changed rounds to the latest state, saving it through conn if anything changed
+    
+    Returns:
+        Tuple of (new state, number of rounds applied)
+    """
+    generation = _generation(conn)
+    if _state is not None and _state['generation'] == generation:
+        # Copy, so a failed transaction leaves the cached state untouched
+        state = dict(_state)
+    else:
+        state = _load(conn)
+    current = datetime.now().year
+    known = dict(zip(
+        zip(state['rounds']['Year'].astype(int), state['rounds']['Round'].astype(int)),
+        state['rounds']['Digest'],
+    ))
+    
+    changed = []
+    for year, rnd in available_rounds():
+        if (year, rnd) in known and year < current:
+            continue
+        results = _results(year, rnd)
+        if results.empty:
+            continue
+        digest = frame_digest(results)
+        if known.get((year, rnd)) != digest:
+            changed.append((year, rnd, digest, contributions(results, year, rnd)))
+    
+    if changed:
+        ledger = state['contributions']
+        replaced = [(year, rnd) for year, rnd, _, _ in changed if (year, rnd) in known]
+        if replaced:
+            stale = pd.MultiIndex.from_frame(ledger[['Year', 'Round']].astype(int)).isin(replaced)
+            for table in TABLES:
+                state[table] = _apply(state[table], _totals(ledger[stale], table), table, -1)
+            ledger = ledger[~stale]
+        
+        delta = pd.concat([contrib for *_, contrib in changed], ignore_index=True)
+        for table in TABLES:
+            state[table] = _apply(state[table], _totals(delta, table), table, 1)
+        state['contributions'] = pd.concat([ledger, delta], ignore_index=True)
+        
+        rounds = state['rounds']
+        if replaced:
+            keys = pd.MultiIndex.from_frame(rounds[['Year', 'Round']].astype(int))
+            rounds = rounds[~keys.isin(replaced)]
+        state['rounds'] = pd.concat([
+            rounds,
+            pd.DataFrame({
+                'Year': [year for year, *_ in changed],
+                'Round': [rnd for _, rnd, *_ in changed],
+                'Digest': [digest for _, _, digest, _ in changed],
+            }),
+        ], ignore_index=True)
+        state['generation'] = generation + 1
+        _save(conn, state)
+    
+    return state, len(changed)
+
+@memoize()
+def career_stats(table='drivers'):
+    """
+    Career statistics of every driver or constructor across the stored seasons
+    
+    Brings the materialized tables up to date first (at most once per memory
+    cache period).
+    
+    Args:
+        table: 'drivers' or 'constructors'
+    
+    Returns:
+        DataFrame with one row per driver/constructor, most wins first
+    """
+    update()
+    key, name = TABLES[table]
+    totals = _state[table]
+    if totals.empty:
+        return pd.DataFrame()
+    
+    starts = totals['Starts'].astype(np.int32)
+    return pd.DataFrame({
+        name: totals[name].astype('category'),
+        'Starts': starts,
+        'Wins': totals['Wins'].astype(np.int32),
+        'Podiums': totals['Podiums'].astype(np.int32),
+        'Poles': totals['Poles'].astype(np.int32),
+        'Points': totals['Points'].astype(np.float64),
+        'DNFs': totals['DNFs'].astype(np.int32),
+        'Avg Finish': (totals['FinishSum'] / starts).astype(np.float32),
+        key: pd.Categorical(totals.index),
+    }).sort_values(['Wins', 'Podiums', 'Points'], ascending=False).reset_index(drop=True)
@@ -0,0 +1,81 @@
+import os
+
+# Ergast-compatible API root; point at tools/ergast_server.py for offline runs
+API_BASE_URL = os.environ.get("F1_API_BASE_URL", "http://api.jolpi.ca/ergast/f1").rstrip("/")
+
+# Directory for everything the app persists between runs (response cache, bundles, ...)
+CACHE_DIR = os.environ.get(
+    "F1_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".f1_cache"),
+)
+
+# Seconds before a cached current-season response is considered stale, for endpoints the
+# race calendar cannot decide on (the calendar itself, future seasons, unknown rounds)
+CURRENT_SEASON_TTL = int(os.environ.get("F1_CURRENT_SEASON_TTL", "3600"))
+
+# Stale-while-revalidate: how long past expiry a cached response may still be served
+# while a background worker refreshes it (0 disables serving stale data)
+MAX_STALENESS = int(os.environ.get("F1_MAX_STALENESS", "86400"))
+REFRESH_WORKERS = int(os.environ.get("F1_REFRESH_WORKERS", "2"))
+
+# Seconds the in-memory parser caches keep a value. Re-reading from the persistent
+# cache is cheap, so this is short to let background refreshes show up quickly.
+MEMORY_CACHE_TTL = int(os.environ.get("F1_MEMORY_CACHE_TTL", "300"))
+
+# HTTP client: (connect, read) timeouts in seconds, retry policy and connection pool size
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("F1_HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("F1_HTTP_READ_TIMEOUT", "20"))
+HTTP_MAX_RETRIES = int(os.environ.get("F1_HTTP_MAX_RETRIES", "4"))
+HTTP_BACKOFF = float(os.environ.get("F1_HTTP_BACKOFF", "0.5"))
+HTTP_POOL_SIZE = int(os.environ.get("F1_HTTP_POOL_SIZE", "16"))
+
+# Client-side rate limit, shared by every session in the process.
+# jolpi.ca allows a burst of 4 requests per second and 500 requests per hour.
+RATE_LIMIT_PER_SECOND = float(os.environ.get("F1_RATE_LIMIT_PER_SECOND", "4"))
+RATE_LIMIT_BURST = int(os.environ.get("F1_RATE_LIMIT_BURST", "4"))
+RATE_LIMIT_PER_HOUR = int(os.environ.get("F1_RATE_LIMIT_PER_HOUR", "500"))
+
+# Pagination: largest page size the API accepts and how many pages to fetch at once
+PAGE_LIMIT = int(os.environ.get("F1_PAGE_LIMIT", "100"))
+PAGE_WORKERS = int(os.environ.get("F1_PAGE_WORKERS", "4"))
+
+# Background season prefetch: worker threads and which per-round endpoints to warm.
+# Laps are left out by default because a season of lap pages costs hundreds of requests.
+PREFETCH_WORKERS = int(os.environ.get("F1_PREFETCH_WORKERS", "2"))
+PREFETCH_ENDPOINTS = tuple(os.environ.get("F1_PREFETCH_ENDPOINTS", "results,qualifying,sprint,pitstops").split(","))
+# Share of each rate limit bucket the season prefetch may spend. Prefetch requests never
+# wait for a token: once their share is used up the rest of the task is dropped.
+PREFETCH_RATE_SHARE = float(os.environ.get("F1_PREFETCH_RATE_SHARE", "0.5"))
+
+# Only run the body of the tab on screen (set F1_LAZY_TABS=0 to render every tab on each rerun)
+LAZY_TABS = os.environ.get("F1_LAZY_TABS", "1") != "0"
+
+# Race-calendar driven invalidation for the current season. A round's data can change from
+# WEEKEND_LEAD_HOURS before the race until RESULTS_WINDOW_HOURS after it (penalties, appeals);
+# inside that window responses are refetched every WINDOW_TTL seconds, outside it never.
+WEEKEND_LEAD_HOURS = float(os.environ.get("F1_WEEKEND_LEAD_HOURS", "72"))
+RESULTS_WINDOW_HOURS = float(os.environ.get("F1_RESULTS_WINDOW_HOURS", "168"))
+WINDOW_TTL = int(os.environ.get("F1_WINDOW_TTL", "900"))
+
+# Shared cache for parsed frames across replicas, e.g. "sqlite:////shared/f1-frames.sqlite3"
+# or "redis://cache:6379/0" (any Redis-protocol server). Empty disables it.
+SHARED_CACHE_URL = os.environ.get("F1_SHARED_CACHE", "")
+
+# Global memory budget (MB) shared by every in-memory parser cache
+MEMORY_BUDGET_MB = float(os.environ.get("F1_MEMORY_BUDGET_MB", "256"))
+
+# Figure cache: memory budget (MB) for Plotly figures, whether to also keep them on disk
+# under CACHE_DIR so restarts and other processes reuse them, and the disk budget (MB)
+# beyond which the least recently used figure files are deleted
+FIGURE_CACHE_MB = float(os.environ.get("F1_FIGURE_CACHE_MB", "32"))
+FIGURE_CACHE_DISK = os.environ.get("F1_FIGURE_CACHE_DISK", "1") != "0"
+FIGURE_CACHE_DISK_MB = float(os.environ.get("F1_FIGURE_CACHE_DISK_MB", "256"))
+
+# Tables longer than this are shown without a pandas Styler (formatting through column config only)
+STYLER_MAX_ROWS = int(os.environ.get("F1_STYLER_MAX_ROWS", "500"))
+
+# Rows per page sent to the browser by paged tables
+TABLE_PAGE_SIZE = int(os.environ.get("F1_TABLE_PAGE_SIZE", "50"))
+
+# First season offered by the dashboard and ingested by tools.ingest
+FIRST_SEASON = int(os.environ.get("F1_FIRST_SEASON", "1950"))
@@ -39,26 +39,4 @@ def get_team_colors():
         'RBR-Honda': '#0600EF',
         'RB F1 Team': '#0600EF',
         'VCARB': '#5E8FAA'
-    }
-
-def time_to_seconds(time_str):
-    """
-    Convert lap time string to seconds
-    
-    Args:
-        time_str: Time string in format "m:ss.ms" or "ss.ms"
-        
-    Returns:
-        Float representing time in seconds, or None if invalid
-    """
-    if not time_str:
-        return None
-    try:
-        if ":" in time_str:
-            minutes, rest = time_str.split(':')
-            seconds = float(rest)
-            return int(minutes) * 60 + seconds
-        else:
-            return float(time_str)
-    except:
-        return None
\ No newline at end of file
+    }
\ No newline at end of file
@@ -0,0 +1,206 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+from utils.config import (
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_MAX_RETRIES, HTTP_BACKOFF, HTTP_POOL_SIZE,
+    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, RATE_LIMIT_PER_HOUR, PREFETCH_RATE_SHARE,
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Longest Retry-After worth sleeping for: the delay of the last backoff step
+MAX_RETRY_AFTER = HTTP_BACKOFF * (2 ** HTTP_MAX_RETRIES)
+
+class RateLimited(Exception):
+    """
+    Raised for background requests when their share of the rate limit is used up
+    """
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that blocks callers until a token is available
+    """
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available
+        
+        Returns:
+            Seconds spent waiting for the token
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+    
+    def try_acquire(self, reserve=0.0):
+        """
+        Take one token without waiting, leaving at least reserve tokens in the bucket
+        
+        Returns:
+            True if a token was taken
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1 + reserve:
+                self.tokens -= 1
+                return True
+            return False
+    
+    def release(self):
+        """
+        Return a token taken by try_acquire that ended up unused
+        """
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+_limiters = [
+    TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST),
+    TokenBucket(RATE_LIMIT_PER_HOUR / 3600.0, RATE_LIMIT_PER_HOUR),
+]
+
+_stats = {'requests': 0, 'throttled': 0, 'throttle_wait': 0.0, 'retried': 0, 'failed': 0, 'dropped': 0}
+_stats_lock = threading.Lock()
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+def _make_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({'Accept': 'application/json'})
+    return session
+
+# One keep-alive connection pool for the whole process
+_session = _make_session()
+
+_mode = threading.local()
+
+@contextmanager
+def background(enabled=True):
+    """
+    Mark requests made by this thread as background work
+    
+    Background requests only spend PREFETCH_RATE_SHARE of each rate limit
+    bucket and never wait: when no token is spare they raise RateLimited, so
+    prefetching cannot delay requests the user is waiting for.
+    """
+    previous = in_background()
+    _mode.background = enabled
+    try:
+        yield
+    finally:
+        _mode.background = previous
+
+def in_background():
+    return getattr(_mode, 'background', False)
+
+def _try_throttle():
+    taken = []
+    for limiter in _limiters:
+        if not limiter.try_acquire(reserve=limiter.capacity * (1 - PREFETCH_RATE_SHARE)):
+            for held in taken:
+                held.release()
+            _count('dropped')
+            raise RateLimited("No spare rate limit budget for background requests")
+        taken.append(limiter)
+
+def _throttle():
+    if in_background():
+        return _try_throttle()
+    waited = sum(limiter.acquire() for limiter in _limiters)
+    if waited > 0:
+        _count('throttled')
+        _count('throttle_wait', waited)
+
+def _retry_delay(attempt, resp=None):
+    """
+    Exponential backoff with jitter, honouring Retry-After when the server sends it
+    
+    Returns:
+        Seconds to sleep, or None when the server asks to wait longer than
+        MAX_RETRY_AFTER and the request should not be retried
+    """
+    if resp is not None:
+        retry_after = resp.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+            return delay if delay <= MAX_RETRY_AFTER else None
+    return HTTP_BACKOFF * (2 ** attempt) * (1 + random.random() / 2)
+
+def get(url, **kwargs):
+    """
+    GET a URL through the shared session, rate limiter and retry policy
+    
+    Args:
+        url: The URL to fetch
+        **kwargs: Extra arguments passed to requests.Session.get
+        
+    Returns:
+        The final requests.Response (possibly a non-200 after retries ran out,
+        or straight away when Retry-After exceeds MAX_RETRY_AFTER, so callers
+        fall back to a cached response instead of blocking a worker)
+        
+    Raises:
+        requests.RequestException: If the connection still fails after all retries
+        RateLimited: If called in background mode without spare rate limit budget
+    """
+    kwargs.setdefault('timeout', (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    attempt = 0
+    while True:
+        _throttle()
+        _count('requests')
+        try:
+            resp = _session.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= HTTP_MAX_RETRIES:
+                _count('failed')
+                raise
+            resp = None
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt >= HTTP_MAX_RETRIES:
+                if resp.status_code != 200:
+                    _count('failed')
+                return resp
+        delay = _retry_delay(attempt, resp)
+        if delay is None:
+            _count('failed')
+            return resp
+        _count('retried')
+        time.sleep(delay)
+        attempt += 1
+
+def get_stats():
+    """
+    Report HTTP client activity since the process started
+    
+    Returns:
+        Dictionary with counts of requests sent, calls throttled by the rate
+        limiter (and total seconds spent waiting), retries, failed calls and
+        background requests dropped for lack of rate limit budget
+    """
+    with _stats_lock:
+        return dict(_stats)
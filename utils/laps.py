@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from utils.memo import memoize
+from utils.parsers import parse_laps
+
+@memoize()
+def get_lap_matrix(year, rnd):
+    """
+    Build a dense lap x driver matrix of lap times for a whole race
+    
+    All timings of the race are fetched once; per-driver and multi-driver views
+    are then in-memory slices of this matrix (see slice_laps).
+    
+    Args:
+        year: The year of the race
+        rnd: The round number
+        
+    Returns:
+        DataFrame indexed by lap number with one float column per driverId,
+        holding lap times in seconds (NaN where a driver has no timing)
+    """
+    laps_df = parse_laps(year, rnd)
+    if laps_df.empty:
+        return pd.DataFrame()
+    
+    lap_numbers = laps_df['Lap'].to_numpy()
+    driver_codes, driver_ids = pd.factorize(laps_df['DriverID'])
+    
+    matrix = np.full((lap_numbers.max(), len(driver_ids)), np.nan)
+    matrix[lap_numbers - 1, driver_codes] = laps_df['Time'].to_numpy()
+    
+    return pd.DataFrame(
+        matrix,
+        index=pd.RangeIndex(1, lap_numbers.max() + 1, name='Lap'),
+        columns=pd.Index(driver_ids, name='DriverID'),
+    )
+
+def slice_laps(lap_matrix, driver_ids):
+    """
+    Extract lap times for some drivers from a lap matrix
+    
+    Args:
+        lap_matrix: Matrix returned by get_lap_matrix
+        driver_ids: Iterable of driverIds to keep
+        
+    Returns:
+        Long DataFrame with Lap, DriverID and Time (seconds) columns, like parse_laps
+    """
+    columns = [d for d in driver_ids if d in lap_matrix.columns]
+    if not columns:
+        return pd.DataFrame()
+    
+    long_df = lap_matrix[columns].melt(ignore_index=False, value_name='Time').reset_index()
+    return long_df.dropna(subset=['Time']).reset_index(drop=True)
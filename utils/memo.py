@@ -0,0 +1,190 @@
+import functools
+import hashlib
+import inspect
+import pickle
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+from utils.config import MEMORY_BUDGET_MB, MEMORY_CACHE_TTL
+
+def sizeof(value):
+    """
+    Measure how many bytes a cached value really occupies
+    
+    DataFrames and Series are measured with memory_usage(deep=True), so
+    string and categorical columns count their actual contents.
+    
+    Args:
+        value: Any cached value
+        
+    Returns:
+        Size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+def frame_digest(df):
+    """
+    Content hash of a DataFrame: values, index, column names and dtypes
+    
+    Args:
+        df: DataFrame to hash
+        
+    Returns:
+        Hex digest string
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    try:
+        h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    except TypeError:
+        # Columns holding unhashable objects (lists, dicts) fall back to their JSON form
+        h.update(df.to_json(orient='split', date_format='iso').encode())
+    return h.hexdigest()
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache bounded by the total measured size of its values
+    """
+    
+    def __init__(self, budget_bytes):
+        self.budget = budget_bytes
+        self.entries = OrderedDict()
+        self.used = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """
+        Returns:
+            Tuple of (found, value)
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[2] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+    
+    def put(self, key, value, ttl, size=None):
+        """
+        Store a value; size overrides sizeof(value) when the caller already knows it
+        """
+        if size is None:
+            size = sizeof(value)
+        if size > self.budget:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, size, time.monotonic() + ttl)
+            self.used += size
+            while self.used > self.budget:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def _remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.used -= size
+    
+    def clear(self, name=None):
+        """
+        Drop every entry, or only those of one function (keys starting with name)
+        """
+        with self.lock:
+            if name is None:
+                self.entries.clear()
+                self.used = 0
+                return
+            for key in [key for key in self.entries if key[0] == name]:
+                self._remove(key)
+    
+    def usage(self):
+        """
+        Report current usage of the cache
+        
+        Returns:
+            Dictionary with bytes used and budget, entry count, hit/miss/eviction
+            counts and bytes used per cached function
+        """
+        with self.lock:
+            per_function = {}
+            for key, (_, size, _) in self.entries.items():
+                per_function[key[0]] = per_function.get(key[0], 0) + size
+            return {
+                'bytes': self.used,
+                'budget': self.budget,
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'per_function': per_function,
+            }
+
+# One budget for every parser, so memory stays bounded however users browse
+_cache = MemoryCache(int(MEMORY_BUDGET_MB * 1024 * 1024))
+
+def set_cache(cache):
+    """
+    Replace the in-memory cache used by every memoized function
+    
+    Args:
+        cache: Object with the get/put/clear(name=None)/usage methods of MemoryCache,
+            e.g. MemoryCache(0) to disable caching in short-lived workers
+    """
+    global _cache
+    _cache = cache
+
+def memoize(ttl=MEMORY_CACHE_TTL):
+    """
+    Decorator caching a function's results in the shared, size-bounded memory cache
+    
+    Callers receive a copy of cached DataFrames, so mutating a result never
+    corrupts the cache.
+    
+    Args:
+        ttl: Seconds a result stays valid
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            # Rounds arrive both as ints and as strings; normalise so they share entries
+            key = (name,) + tuple(str(v) for v in bound.arguments.values())
+            
+            found, value = _cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                _cache.put(key, value, ttl)
+            return value.copy() if isinstance(value, (pd.DataFrame, pd.Series)) else value
+        
+        wrapper.clear = lambda: _cache.clear(name)
+        return wrapper
+    return decorator
+
+def memory_usage():
+    """
+    Report how much memory the parser caches use
+    
+    Returns:
+        Dictionary described in MemoryCache.usage
+    """
+    return _cache.usage()
@@ -1,9 +1,31 @@
+import numpy as np
 import pandas as pd
-import streamlit as st
 from datetime import datetime
-from utils.api import get_f1_data
+from utils.api import get_f1_data_paginated
+from utils.bundle import load_frame
+from utils.memo import memoize
+from utils.shared_cache import shared_frames
+from utils.timing import to_seconds
 
-@st.cache_data(ttl=3600)
+# Join keys carried by the parsed frames; not meant for display
+KEY_COLUMNS = ['DriverID', 'ConstructorID']
+
+def _numbers(values, dtype):
+    """
+    Convert a list of numeric strings to a compact NumPy array in one pass
+    """
+    return np.asarray(values, dtype=str).astype(dtype)
+
+def _driver_names(drivers):
+    """
+    Build "givenName familyName" for a list of Driver objects as a categorical
+    """
+    given = pd.Series([d['givenName'] for d in drivers], dtype=str)
+    family = pd.Series([d['familyName'] for d in drivers], dtype=str)
+    return pd.Categorical(given + ' ' + family)
+
+@memoize()
+@shared_frames(lambda year: f"{year}/driverStandings.json")
 def parse_driver_standings(year):
     """
     Parse driver standings data from API
@@ -14,23 +36,34 @@ def parse_driver_standings(year):
     Returns:
         DataFrame with driver standings
     """
-    data = get_f1_data(f"{year}/driverStandings.json")
+    bundled = load_frame(year, 'driver_standings')
+    if bundled is not None:
+        return bundled
+    
+    data = get_f1_data_paginated(f"{year}/driverStandings.json")
     if not data:
         return pd.DataFrame()
     
-    lst = data['MRData']['StandingsTable']['StandingsLists'][0]['DriverStandings']
-    rows = []
-    for e in lst:
-        rows.append({
-            'Position': int(e['position']),
-            'Driver': f"{e['Driver']['givenName']} {e['Driver']['familyName']}",
-            'Constructor': e['Constructors'][0]['name'],
-            'Points': float(e['points']),
-            'Wins': int(e['wins'])
-        })
-    return pd.DataFrame(rows)
+    lists = data['MRData']['StandingsTable']['StandingsLists']
+    lst = lists[0]['DriverStandings'] if lists else []
+    if not lst:
+        return pd.DataFrame()
+    
+    drivers = [e['Driver'] for e in lst]
+    # Some early-season entries list no constructor; excluded drivers (1997) have no position
+    constructors = [(e.get('Constructors') or [{}])[0] for e in lst]
+    return pd.DataFrame({
+        'Position': _numbers([e.get('position', str(i)) for i, e in enumerate(lst, 1)], np.int16),
+        'Driver': _driver_names(drivers),
+        'Constructor': pd.Categorical([c.get('name') for c in constructors]),
+        'Points': _numbers([e['points'] for e in lst], np.float64),
+        'Wins': _numbers([e['wins'] for e in lst], np.int16),
+        'DriverID': pd.Categorical([d['driverId'] for d in drivers]),
+        'ConstructorID': pd.Categorical([c.get('constructorId') for c in constructors]),
+    })
 
-@st.cache_data(ttl=3600)
+@memoize()
+@shared_frames(lambda year: f"{year}/constructorStandings.json")
 def parse_constructor_standings(year):
     """
     Parse constructor standings data from API
@@ -41,22 +74,30 @@ def parse_constructor_standings(year):
     Returns:
         DataFrame with constructor standings
     """
-    data = get_f1_data(f"{year}/constructorStandings.json")
+    bundled = load_frame(year, 'constructor_standings')
+    if bundled is not None:
+        return bundled
+    
+    data = get_f1_data_paginated(f"{year}/constructorStandings.json")
     if not data:
         return pd.DataFrame()
     
-    lst = data['MRData']['StandingsTable']['StandingsLists'][0]['ConstructorStandings']
-    rows = []
-    for e in lst:
-        rows.append({
-            'Position': int(e['position']),
-            'Constructor': e['Constructor']['name'],
-            'Points': float(e['points']),
-            'Wins': int(e['wins'])
-        })
-    return pd.DataFrame(rows)
+    # There is no constructors' championship before 1958; excluded teams (2007) have no position
+    lists = data['MRData']['StandingsTable']['StandingsLists']
+    lst = lists[0]['ConstructorStandings'] if lists else []
+    if not lst:
+        return pd.DataFrame()
+    
+    return pd.DataFrame({
+        'Position': _numbers([e.get('position', str(i)) for i, e in enumerate(lst, 1)], np.int16),
+        'Constructor': pd.Categorical([e['Constructor']['name'] for e in lst]),
+        'Points': _numbers([e['points'] for e in lst], np.float64),
+        'Wins': _numbers([e['wins'] for e in lst], np.int16),
+        'ConstructorID': pd.Categorical([e['Constructor']['constructorId'] for e in lst]),
+    })
 
-@st.cache_data(ttl=3600)
+@memoize()
+@shared_frames(lambda year: f"{year}/races.json")
 def parse_races(year):
     """
     Parse race calendar data from API
@@ -67,13 +108,22 @@ def parse_races(year):
     Returns:
         DataFrame with race calendar
     """
-    data = get_f1_data(f"{year}/races.json")
+    bundled = load_frame(year, 'races')
+    if bundled is not None:
+        return bundled
+    
+    data = get_f1_data_paginated(f"{year}/races.json")
     if not data:
         return pd.DataFrame()
     
     lst = data['MRData']['RaceTable']['Races']
     df = pd.json_normalize(lst)
+    # int8 holds any round number: no season has had more than 24 rounds
+    df['round'] = _numbers(df['round'], np.int8)
     df['date'] = pd.to_datetime(df['date'])
+    for col in ('Circuit.Location.lat', 'Circuit.Location.long'):
+        if col in df.columns:
+            df[col] = _numbers(df[col], np.float32)
     
     # Add a column for races that have already happened
     current_date = datetime.now()
@@ -81,7 +131,8 @@ def parse_races(year):
     
     return df
 
-@st.cache_data(ttl=3600)
+@memoize()
+@shared_frames(lambda year, rnd: f"{year}/{rnd}/results.json")
 def parse_results(year, rnd):
     """
     Parse race results data from API
@@ -93,27 +144,34 @@ def parse_results(year, rnd):
     Returns:
         DataFrame with race results
     """
-    data = get_f1_data(f"{year}/{rnd}/results.json")
+    bundled = load_frame(year, 'results', rnd)
+    if bundled is not None:
+        return bundled
+    
+    data = get_f1_data_paginated(f"{year}/{rnd}/results.json")
     if not data or 'MRData' not in data or 'RaceTable' not in data['MRData'] or 'Races' not in data['MRData']['RaceTable'] or len(data['MRData']['RaceTable']['Races']) == 0:
         return pd.DataFrame()
     
     lst = data['MRData']['RaceTable']['Races'][0]['Results']
-    rows = []
-    for e in lst:
-        time = e.get('Time', {}).get('time', None)
-        rows.append({
-            'Position': int(e['position']),
-            'Driver': f"{e['Driver']['givenName']} {e['Driver']['familyName']}",
-            'Constructor': e['Constructor']['name'],
-            'Grid': int(e['grid']),
-            'Laps': int(e['laps']),
-            'Time': time,
-            'Status': e['status'],
-            'Points': float(e['points'])
-        })
-    return pd.DataFrame(rows)
+    if not lst:
+        return pd.DataFrame()
+    
+    drivers = [e['Driver'] for e in lst]
+    return pd.DataFrame({
+        'Position': _numbers([e['position'] for e in lst], np.int16),
+        'Driver': _driver_names(drivers),
+        'Constructor': pd.Categorical([e['Constructor']['name'] for e in lst]),
+        'Grid': _numbers([e['grid'] for e in lst], np.int16),
+        'Laps': _numbers([e['laps'] for e in lst], np.int16),
+        'Time': [e.get('Time', {}).get('time', None) for e in lst],
+        'Status': pd.Categorical([e['status'] for e in lst]),
+        'Points': _numbers([e['points'] for e in lst], np.float64),
+        'DriverID': pd.Categorical([d['driverId'] for d in drivers]),
+        'ConstructorID': pd.Categorical([e['Constructor']['constructorId'] for e in lst]),
+    })
 
-@st.cache_data(ttl=3600)
+@memoize()
+@shared_frames(lambda year, rnd: f"{year}/{rnd}/qualifying.json")
 def parse_qualifying(year, rnd):
     """
     Parse qualifying results data from API
@@ -125,22 +183,32 @@ def parse_qualifying(year, rnd):
     Returns:
         DataFrame with qualifying results
     """
-    data = get_f1_data(f"{year}/{rnd}/qualifying.json")
+    bundled = load_frame(year, 'qualifying', rnd)
+    if bundled is not None:
+        return bundled
+    
+    data = get_f1_data_paginated(f"{year}/{rnd}/qualifying.json")
     if not data or 'MRData' not in data or 'RaceTable' not in data['MRData'] or 'Races' not in data['MRData']['RaceTable'] or len(data['MRData']['RaceTable']['Races']) == 0:
         return pd.DataFrame()
     
     lst = data['MRData']['RaceTable']['Races'][0].get('QualifyingResults', [])
-    rows = []
-    for e in lst:
-        rows.append({
-            'Position': int(e['position']),
-            'Driver': f"{e['Driver']['givenName']} {e['Driver']['familyName']}",
-            'Constructor': e['Constructor']['name'],
-            'Q1': e.get('Q1'), 'Q2': e.get('Q2'), 'Q3': e.get('Q3')
-        })
-    return pd.DataFrame(rows)
+    if not lst:
+        return pd.DataFrame()
+    
+    drivers = [e['Driver'] for e in lst]
+    return pd.DataFrame({
+        'Position': _numbers([e['position'] for e in lst], np.int16),
+        'Driver': _driver_names(drivers),
+        'Constructor': pd.Categorical([e['Constructor']['name'] for e in lst]),
+        'Q1': to_seconds([e.get('Q1') for e in lst]),
+        'Q2': to_seconds([e.get('Q2') for e in lst]),
+        'Q3': to_seconds([e.get('Q3') for e in lst]),
+        'DriverID': pd.Categorical([d['driverId'] for d in drivers]),
+        'ConstructorID': pd.Categorical([e['Constructor']['constructorId'] for e in lst]),
+    })
 
-@st.cache_data(ttl=3600)
+@memoize()
+@shared_frames(lambda year, rnd: f"{year}/{rnd}/sprint.json")
 def parse_sprint(year, rnd):
     """
     Parse sprint race results data from API
@@ -152,7 +220,11 @@ def parse_sprint(year, rnd):
     Returns:
         DataFrame with sprint results
     """
-    data = get_f1_data(f"{year}/{rnd}/sprint.json")
+    bundled = load_frame(year, 'sprint', rnd)
+    if bundled is not None:
+        return bundled
+    
+    data = get_f1_data_paginated(f"{year}/{rnd}/sprint.json")
     if not data:
         return pd.DataFrame()
     
@@ -163,19 +235,22 @@ def parse_sprint(year, rnd):
         return pd.DataFrame()
     
     results_list = sprint_info[0].get('SprintResults', [])
-    rows = []
-    for e in results_list:
-        time_str = e.get('Time', {}).get('time', "")
-        rows.append({
-            'Position': int(e['position']),
-            'Driver': f"{e['Driver']['givenName']} {e['Driver']['familyName']}",
-            'Constructor': e['Constructor']['name'],
-            'Time': time_str,
-            'Points': float(e['points'])
-        })
-    return pd.DataFrame(rows)
+    if not results_list:
+        return pd.DataFrame()
+    
+    drivers = [e['Driver'] for e in results_list]
+    return pd.DataFrame({
+        'Position': _numbers([e['position'] for e in results_list], np.int16),
+        'Driver': _driver_names(drivers),
+        'Constructor': pd.Categorical([e['Constructor']['name'] for e in results_list]),
+        'Time': [e.get('Time', {}).get('time', "") for e in results_list],
+        'Points': _numbers([e['points'] for e in results_list], np.float64),
+        'DriverID': pd.Categorical([d['driverId'] for d in drivers]),
+        'ConstructorID': pd.Categorical([e['Constructor']['constructorId'] for e in results_list]),
+    })
 
-@st.cache_data(ttl=3600)
+@memoize()
+@shared_frames(lambda year, rnd: f"{year}/{rnd}/pitstops.json")
 def parse_pitstops(year, rnd):
     """
     Parse pit stop data from API
@@ -187,22 +262,35 @@ def parse_pitstops(year, rnd):
     Returns:
         DataFrame with pit stop data
     """
-    data = get_f1_data(f"{year}/{rnd}/pitstops.json")
+    bundled = load_frame(year, 'pitstops', rnd)
+    if bundled is not None:
+        return bundled
+    
+    data = get_f1_data_paginated(f"{year}/{rnd}/pitstops.json")
     if not data or 'MRData' not in data or 'RaceTable' not in data['MRData'] or 'Races' not in data['MRData']['RaceTable'] or len(data['MRData']['RaceTable']['Races']) == 0:
         return pd.DataFrame()
     
     lst = data['MRData']['RaceTable']['Races'][0].get('PitStops', [])
-    rows = []
-    for e in lst:
-        rows.append({
-            'DriverID': e['driverId'],
-            'Stop': int(e['stop']),
-            'Lap': int(e['lap']),
-            'Duration': e['duration']
-        })
-    return pd.DataFrame(rows)
+    if not lst:
+        return pd.DataFrame()
+    
+    return pd.DataFrame({
+        'DriverID': pd.Categorical([e['driverId'] for e in lst]),
+        'Stop': _numbers([e['stop'] for e in lst], np.int16),
+        'Lap': _numbers([e['lap'] for e in lst], np.int16),
+        'Duration': to_seconds([e['duration'] for e in lst]),
+    })
 
-@st.cache_data(ttl=3600)
+def laps_endpoint(year, rnd, driver_id=None):
+    """
+    API endpoint for a race's lap timings, optionally for one driver
+    """
+    if driver_id:
+        return f"{year}/{rnd}/drivers/{driver_id}/laps.json"
+    return f"{year}/{rnd}/laps.json"
+
+@memoize()
+@shared_frames(laps_endpoint)
 def parse_laps(year, rnd, driver_id=None):
     """
     Parse lap time data from API
@@ -215,12 +303,14 @@ def parse_laps(year, rnd, driver_id=None):
     Returns:
         DataFrame with lap time data
     """
-    # Safely fetch lap data; may not exist for all rounds/drivers
-    ep = f"{year}/{rnd}/laps.json"
-    if driver_id:
-        ep = f"{year}/{rnd}/drivers/{driver_id}/laps.json"
+    bundled = load_frame(year, 'laps', rnd)
+    if bundled is not None:
+        if driver_id and not bundled.empty:
+            bundled = bundled[bundled['DriverID'] == driver_id].reset_index(drop=True)
+        return bundled
     
-    data = get_f1_data(ep)
+    # Safely fetch lap data; may not exist for all rounds/drivers
+    data = get_f1_data_paginated(laps_endpoint(year, rnd, driver_id))
     if not data:
         return pd.DataFrame()
     
@@ -231,25 +321,19 @@ def parse_laps(year, rnd, driver_id=None):
         return pd.DataFrame()
     
     laps_list = races[0].get('Laps', [])
-    rows = []
-    for lap in laps_list:
-        lap_num = int(lap.get('number', 0))
-        timings = lap.get('Timings', [])
-        for e in timings:
-            rows.append({
-                'Lap': lap_num,
-                'DriverID': e.get('driverId'),
-                'Time': e.get('time')
-            })
+    timings = [(lap.get('number', '0'), e) for lap in laps_list for e in lap.get('Timings', [])]
     
     # Return the dataframe
-    if not rows:
+    if not timings:
         return pd.DataFrame()
     
-    df = pd.DataFrame(rows)
-    return df
+    return pd.DataFrame({
+        'Lap': _numbers([number for number, _ in timings], np.int16),
+        'DriverID': pd.Categorical([e.get('driverId') for _, e in timings]),
+        'Time': to_seconds([e.get('time') for _, e in timings]),
+    })
 
-@st.cache_data(ttl=3600)
+@memoize()
 def get_race_details(year, rnd):
     """
     Helper function to get race details for header
@@ -275,4 +359,20 @@ def get_race_details(year, rnd):
             'country': race.get('Circuit.Location.country', ""),
         }
     except:
-        return None
\ No newline at end of file
+        return None
+
+
+# Parser for each bundle/warm-up kind, keyed like utils.bundle.SEASON_KINDS and ROUND_KINDS
+SEASON_PARSERS = {
+    'races': parse_races,
+    'driver_standings': parse_driver_standings,
+    'constructor_standings': parse_constructor_standings,
+}
+
+ROUND_PARSERS = {
+    'results': parse_results,
+    'qualifying': parse_qualifying,
+    'sprint': parse_sprint,
+    'pitstops': parse_pitstops,
+    'laps': parse_laps,
+}
@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from utils import cache, http
+from utils.api import fetch_all, page_endpoint
+from utils.bundle import has_data, load_season_bundle
+from utils.config import CURRENT_SEASON_TTL, PAGE_LIMIT, PREFETCH_WORKERS, PREFETCH_ENDPOINTS
+
+# Every endpoint the race analysis tab reads for a single round
+ROUND_ENDPOINTS = ("results", "qualifying", "sprint", "pitstops", "laps")
+
+# Separate pools so the view the user is waiting for never queues behind background warming
+_foreground = ThreadPoolExecutor(max_workers=len(ROUND_ENDPOINTS), thread_name_prefix="f1-round")
+_background = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="f1-season")
+
+_lock = threading.Lock()
+_warmed = {}
+
+def _claim(key):
+    """
+    Mark a prefetch as started, unless it already ran recently
+    
+    Returns:
+        True if the caller should run the prefetch
+    """
+    now = time.time()
+    with _lock:
+        if now - _warmed.get(key, 0) < CURRENT_SEASON_TTL:
+            return False
+        _warmed[key] = now
+        return True
+
+def _cached(endpoint):
+    """
+    Whether the first page of an endpoint is in the persistent cache and still fresh
+    """
+    found, expires_at = cache.expiry(page_endpoint(endpoint, PAGE_LIMIT, 0))
+    return found and (expires_at is None or expires_at > time.time())
+
+def _warm(endpoint, background=False):
+    if _cached(endpoint):
+        return
+    try:
+        with http.background(background):
+            fetch_all(endpoint)
+    except Exception:
+        # Errors are reported when the UI fetches the endpoint itself; background
+        # tasks without spare rate limit budget are dropped the same way
+        pass
+
+def prefetch_round(year, rnd, needed=()):
+    """
+    Fetch the per-round endpoints on screen and warm the rest of the round in the background
+    
+    Only the endpoints in needed are fetched before returning, in one parallel
+    batch. The others are queued on the background pool without waiting, once
+    per round per cache period, and only spend the background share of the
+    rate limit, so switching tabs later is a local read.
+    
+    Args:
+        year: The year of the race
+        rnd: The round number
+        needed: Names from ROUND_ENDPOINTS the open view reads
+    """
+    # Bundled seasons are read from the bundle, never from the API
+    if load_season_bundle(year) is not None:
+        return
+    names = [name for name in ROUND_ENDPOINTS if has_data(year, name)]
+    futures = [_foreground.submit(_warm, f"{year}/{rnd}/{name}.json") for name in names if name in needed]
+    if _claim(('round', year, str(rnd))):
+        for name in names:
+            if name not in needed:
+                _background.submit(_warm, f"{year}/{rnd}/{name}.json", background=True)
+    wait(futures)
+
+def prefetch_season(year, rounds):
+    """
+    Warm the per-round endpoints of a whole season in the background
+    
+    Returns immediately; the work runs on a bounded thread pool and is only
+    scheduled once per season per cache period. Bundled seasons, kinds the
+    season has no data of and endpoints already cached are skipped, and requests only spend the background share of the rate limit
+    (see utils.http.background), so they never delay a foreground fetch.
+    
+    Args:
+        year: The season to prefetch
+        rounds: Round numbers to prefetch (normally the completed ones)
+    """
+    if load_season_bundle(year) is not None or not _claim(('season', year)):
+        return
+    names = [name for name in PREFETCH_ENDPOINTS if has_data(year, name)]
+    for rnd in rounds:
+        for name in names:
+            _background.submit(_warm, f"{year}/{rnd}/{name}.json", background=True)
@@ -0,0 +1,112 @@
+import re
+from datetime import datetime, timezone
+from utils.config import CURRENT_SEASON_TTL, WEEKEND_LEAD_HOURS, RESULTS_WINDOW_HOURS, WINDOW_TTL
+
+def endpoint_season(endpoint):
+    """
+    Extract the season an endpoint belongs to
+    
+    Args:
+        endpoint: API endpoint such as "2008/5/results.json"
+        
+    Returns:
+        Season year as int, or None for endpoints not tied to a season
+    """
+    match = re.match(r"^(\d{4})(?:[/.?]|$)", endpoint)
+    return int(match.group(1)) if match else None
+
+def endpoint_round(endpoint):
+    """
+    Extract the round an endpoint belongs to
+    
+    Args:
+        endpoint: API endpoint such as "2008/5/results.json"
+        
+    Returns:
+        Round number as int, or None for season-level endpoints
+    """
+    match = re.match(r"^\d{4}/(\d+)(?:[/.?]|$)", endpoint)
+    return int(match.group(1)) if match else None
+
+def is_calendar(endpoint):
+    """
+    Whether an endpoint is the season calendar itself
+    """
+    return re.match(r"^\d{4}(?:/races)?\.json(?:\?|$)", endpoint) is not None
+
+def needs_calendar(endpoint, now):
+    """
+    Whether expiry_for needs the race calendar to decide on this endpoint
+    
+    Args:
+        endpoint: The API endpoint
+        now: Current Unix timestamp
+    """
+    season = endpoint_season(endpoint)
+    return (
+        season is not None
+        and season == datetime.fromtimestamp(now, timezone.utc).year
+        and not is_calendar(endpoint)
+    )
+
+def race_times(races_payload):
+    """
+    Read race start times from a races.json response
+    
+    Args:
+        races_payload: JSON response of "{year}/races.json"
+        
+    Returns:
+        Dictionary of round number to race start as a Unix timestamp
+    """
+    times = {}
+    for race in races_payload.get('MRData', {}).get('RaceTable', {}).get('Races', []):
+        clock = race.get('time', '12:00:00Z').rstrip('Z')
+        start = datetime.fromisoformat(f"{race['date']}T{clock}").replace(tzinfo=timezone.utc)
+        times[int(race['round'])] = start.timestamp()
+    return times
+
+def _window(start):
+    return start - WEEKEND_LEAD_HOURS * 3600, start + RESULTS_WINDOW_HOURS * 3600
+
+def _expiry_in_windows(windows, now):
+    """
+    Expiry for data that can only change inside the given time windows
+    """
+    if any(opens <= now < closes for opens, closes in windows):
+        return now + WINDOW_TTL
+    upcoming = [opens for opens, _ in windows if opens > now]
+    # Nothing left that could change it: the data is final
+    return min(upcoming) if upcoming else None
+
+def expiry_for(endpoint, now, calendar=None):
+    """
+    Decide when a response fetched now can next change upstream
+    
+    Completed seasons are frozen. For the current season the race calendar
+    drives expiry: a round's endpoints only change during its race weekend
+    and the results window after it, season-level endpoints (standings) only
+    during any round's window. Without a calendar, and for the calendar
+    itself, a fixed CURRENT_SEASON_TTL applies.
+    
+    Args:
+        endpoint: The API endpoint of the response
+        now: Unix timestamp the response was fetched at
+        calendar: Optional race_times() of the endpoint's season
+        
+    Returns:
+        Unix timestamp the response expires at, or None if it never expires
+    """
+    season = endpoint_season(endpoint)
+    current_year = datetime.fromtimestamp(now, timezone.utc).year
+    if season is not None and season < current_year:
+        return None
+    if season is None or season > current_year or is_calendar(endpoint) or not calendar:
+        return now + CURRENT_SEASON_TTL
+    
+    rnd = endpoint_round(endpoint)
+    if rnd is None:
+        return _expiry_in_windows([_window(start) for start in calendar.values()], now)
+    if rnd not in calendar:
+        return now + CURRENT_SEASON_TTL
+    return _expiry_in_windows([_window(calendar[rnd])], now)
@@ -0,0 +1,168 @@
+import functools
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+from utils import cache
+from utils.api import page_endpoint
+from utils.arrow import FRAME_VERSION, frame_to_ipc, frame_from_ipc
+from utils.config import SHARED_CACHE_URL, PAGE_LIMIT, MEMORY_CACHE_TTL
+
+class SQLiteBackend:
+    """
+    Shared frame cache in a SQLite file in WAL mode
+    
+    Suitable for replicas on the same host sharing a volume; WAL needs shared
+    memory, so the file must not live on a network filesystem.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+    
+    def _connect(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS frames ("
+                "key TEXT PRIMARY KEY, "
+                "payload BLOB NOT NULL, "
+                "expires_at REAL)"
+            )
+            self.local.conn = conn
+        return conn
+    
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT payload FROM frames WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key, payload, expires_at):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO frames (key, payload, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+
+class RedisBackend:
+    """
+    Shared frame cache on any Redis-protocol server
+    
+    Requires the optional redis package.
+    """
+    
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("The redis package is required for a redis:// shared cache") from e
+        self.client = redis.Redis.from_url(url)
+    
+    def get(self, key):
+        return self.client.get(f"f1:frame:{key}")
+    
+    def set(self, key, payload, expires_at):
+        if expires_at is None:
+            self.client.set(f"f1:frame:{key}", payload)
+        else:
+            self.client.set(f"f1:frame:{key}", payload, exat=int(expires_at) + 1)
+
+def backend_from_url(url):
+    """
+    Create a backend from a cache URL
+    
+    Args:
+        url: "sqlite:///relative.sqlite3", "sqlite:////absolute.sqlite3" or "redis://host:port/db"
+        
+    Returns:
+        A backend object with get(key) and set(key, payload, expires_at), or None for ""
+    """
+    if not url:
+        return None
+    scheme = urlsplit(url).scheme
+    if scheme == "sqlite":
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported shared cache URL: {url}")
+
+_backend = backend_from_url(SHARED_CACHE_URL)
+
+def set_backend(backend):
+    """
+    Replace the shared cache backend (None disables the shared cache)
+    
+    Args:
+        backend: Object with get(key) -> bytes or None and
+            set(key, payload, expires_at) methods
+    """
+    global _backend
+    _backend = backend
+
+def _expiry(endpoint):
+    """
+    Expiry for a frame parsed from an endpoint, mirroring its cached response
+    
+    Returns:
+        Tuple of (storable, expires_at). Frames are only shared when their
+        response is in the persistent cache, so a failed fetch is never
+        spread to other replicas; frames parsed from a stale response only
+        live briefly.
+    """
+    found, expires_at = cache.expiry(page_endpoint(endpoint, PAGE_LIMIT, 0))
+    if not found:
+        return False, None
+    if expires_at is not None and expires_at <= time.time():
+        return True, time.time() + MEMORY_CACHE_TTL
+    return True, expires_at
+
+def shared_frames(endpoint_for):
+    """
+    Decorator sharing a parser's DataFrames through the shared cache backend
+    
+    The frame is stored Arrow-serialized, so any replica that parsed it once
+    warms all the others.
+    
+    Args:
+        endpoint_for: Function taking the parser's arguments and returning the
+            API endpoint the frame is parsed from
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            backend = _backend
+            if backend is None:
+                return func(*args, **kwargs)
+            
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = ":".join([f"v{FRAME_VERSION}", func.__name__] + [str(v) for v in bound.arguments.values()])
+            try:
+                payload = backend.get(key)
+            except Exception:
+                payload = None
+            if payload is not None:
+                return frame_from_ipc(payload)
+            
+            df = func(*args, **kwargs)
+            storable, expires_at = _expiry(endpoint_for(*args, **kwargs))
+            if storable:
+                try:
+                    backend.set(key, frame_to_ipc(df), expires_at)
+                except Exception:
+                    # The shared cache is an optimisation; an unreachable backend must not break parsing
+                    pass
+            return df
+        return wrapper
+    return decorator
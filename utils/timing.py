@@ -0,0 +1,38 @@
+import pandas as pd
+
+# "h:mm:ss.sss", "m:ss.sss" or "ss.sss"
+_TIME_PATTERN = r'^\s*(?:(?:(?P<h>\d+):)?(?P<m>\d+):)?(?P<s>\d+(?:\.\d+)?)\s*$'
+
+def to_seconds(values):
+    """
+    Convert timing strings to float seconds in one vectorized pass
+    
+    Args:
+        values: Series or list of strings in "h:mm:ss.sss", "m:ss.sss" or
+            "ss.sss" format; missing or malformed entries are allowed
+        
+    Returns:
+        float64 Series of seconds (NaN where a value could not be parsed)
+    """
+    strings = pd.Series(values, dtype=object).astype('string')
+    parts = strings.str.extract(_TIME_PATTERN)
+    seconds = pd.to_numeric(parts['s'], errors='coerce').astype('float64')
+    minutes = pd.to_numeric(parts['m'], errors='coerce').fillna(0).astype('float64')
+    hours = pd.to_numeric(parts['h'], errors='coerce').fillna(0).astype('float64')
+    return (hours * 3600 + minutes * 60 + seconds).rename(getattr(values, 'name', None))
+
+def format_laptime(seconds):
+    """
+    Format float seconds as "m:ss.sss" timing strings in one vectorized pass
+    
+    Args:
+        seconds: Series of seconds, e.g. from to_seconds
+        
+    Returns:
+        string Series ("" where a value is missing)
+    """
+    seconds = pd.Series(seconds, dtype='float64')
+    millis = (seconds * 1000).round()
+    minutes = (millis // 60000).astype('Int64').astype('string')
+    rest = ((millis % 60000) / 1000).map('{:06.3f}'.format, na_action='ignore').astype('string')
+    return (minutes + ':' + rest).fillna('').rename(seconds.name)
@@ -1,5 +1,7 @@
 import plotly.express as px
+from visualizations.figure_cache import cached_figure
 
+@cached_figure
 def create_calendar_map(races_df):
     """
     Create a world map visualization with race locations
@@ -0,0 +1,134 @@
+import functools
+import hashlib
+import os
+import shutil
+import threading
+import time
+import plotly.io as pio
+from utils.config import CACHE_DIR, FIGURE_CACHE_DISK, FIGURE_CACHE_DISK_MB, FIGURE_CACHE_MB
+from utils.memo import MemoryCache, frame_digest
+
+# Bump whenever a cached chart function changes how it draws, so stored figures are rebuilt
+FIGURE_VERSION = 1
+
+FIGURE_ROOT = os.path.join(CACHE_DIR, "figures")
+FIGURE_DIR = os.path.join(FIGURE_ROOT, f"v{FIGURE_VERSION}")
+
+# Seconds between scans of the figure directory for files over the disk budget
+PRUNE_INTERVAL = 60
+
+_figures = MemoryCache(int(FIGURE_CACHE_MB * 1024 * 1024))
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+def _key(name, df, args, kwargs):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{name}:{frame_digest(df)}:{args!r}:{sorted(kwargs.items())!r}".encode())
+    return h.hexdigest()
+
+def _read(path):
+    try:
+        with open(path) as f:
+            payload = f.read()
+        # Reads count as use, so pruning removes the least recently used figures
+        os.utime(path)
+        return payload
+    except OSError:
+        return None
+
+def _write(path, payload):
+    try:
+        os.makedirs(FIGURE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The disk copy is only an optimisation
+        pass
+
+def prune(budget_bytes=None):
+    """
+    Delete the least recently used figure files until the directory fits its budget
+    
+    Directories of older FIGURE_VERSIONs are removed entirely.
+    
+    Args:
+        budget_bytes: Bytes to keep (FIGURE_CACHE_DISK_MB by default)
+    
+    Returns:
+        Number of files deleted
+    """
+    if budget_bytes is None:
+        budget_bytes = FIGURE_CACHE_DISK_MB * 1024 * 1024
+    try:
+        for entry in os.scandir(FIGURE_ROOT):
+            if entry.is_dir() and entry.path != FIGURE_DIR:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        files = []
+        for entry in os.scandir(FIGURE_DIR):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return 0
+    
+    used = sum(size for _, size, _ in files)
+    deleted = 0
+    for _, size, path in sorted(files):
+        if used <= budget_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        used -= size
+        deleted += 1
+    return deleted
+
+def _maybe_prune():
+    global _last_prune
+    now = time.monotonic()
+    with _prune_lock:
+        if now - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = now
+    prune()
+
+def cached_figure(func):
+    """
+    Decorator caching a chart function's figure by the content of its input
+    
+    Figures are kept in memory as built (and on disk as JSON, unless
+    F1_FIGURE_CACHE_DISK=0), keyed by a hash of the DataFrame passed as first
+    argument plus the other arguments. Unchanged data is never redrawn; a
+    completed season's charts are built once. Cached figures are shared
+    between callers and must be treated as read-only.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if df.empty:
+            return func(df, *args, **kwargs)
+        
+        key = _key(name, df, args, kwargs)
+        found, fig = _figures.get(key)
+        if found:
+            return fig
+        
+        path = os.path.join(FIGURE_DIR, f"{key}.json")
+        payload = _read(path) if FIGURE_CACHE_DISK else None
+        if payload is not None:
+            fig = pio.from_json(payload) if payload else None
+        else:
+            fig = func(df, *args, **kwargs)
+            payload = fig.to_json() if fig is not None else ""
+            if FIGURE_CACHE_DISK:
+                _write(path, payload)
+                _maybe_prune()
+        # The JSON length is a cheap stand-in for the figure's size in memory
+        _figures.put(key, fig, float('inf'), size=len(payload))
+        return fig
+    
+    return wrapper
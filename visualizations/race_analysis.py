@@ -1,7 +1,10 @@
+import numpy as np
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.helpers import get_team_colors, time_to_seconds
+from visualizations.figure_cache import cached_figure
 
+@cached_figure
 def create_race_results_positions(results_df):
     """
     Create a visualization of position changes during a race
@@ -15,41 +18,34 @@ def create_race_results_positions(results_df):
     if results_df.empty:
         return None
     
-    team_colors = get_team_colors()
-    
-    # Create a copy for plotting
-    plot_df = results_df.copy()
+    # Sort by finishing position
+    plot_df = results_df.sort_values('Position')
     
-    # Create a color mapping for each constructor
-    constructor_colors = {constructor: team_colors.get(constructor, '#333333') 
-                         for constructor in plot_df['Constructor'].unique()}
+    drivers = plot_df['Driver'].astype(str).reset_index(drop=True)
+    grid = plot_df['Grid'].to_numpy(dtype=np.int16)
+    position = plot_df['Position'].to_numpy(dtype=np.int16)
     
     # Set up position gain/loss
-    plot_df['PositionChange'] = plot_df['Grid'] - plot_df['Position'].astype(int)
-    plot_df['ChangeColor'] = plot_df['PositionChange'].apply(
-        lambda x: 'green' if x > 0 else ('red' if x < 0 else 'gray')
+    change = grid - position
+    change_text = pd.Series(np.where(change > 0, '+', '')) + change.astype(str)
+    hover = (
+        drivers + ' (' + plot_df['Constructor'].astype(str).reset_index(drop=True)
+        + ')<br>Start: P' + grid.astype(str) + '<br>Finish: P' + position.astype(str)
+        + '<br>Change: ' + change_text
     )
     
-    # Create horizontal bar chart for position changes
-    fig = go.Figure()
-    
-    # Sort by finishing position
-    plot_df = plot_df.sort_values('Position')
-    
-    # Add bars for each driver
-    for _, row in plot_df.iterrows():
-        fig.add_trace(go.Bar(
-            y=[row['Driver']],
-            x=[abs(row['PositionChange'])] if row['PositionChange'] != 0 else [0.5],
-            orientation='h',
-            marker_color=row['ChangeColor'] if row['PositionChange'] != 0 else 'gray',
-            text=f"{'+' if row['PositionChange'] > 0 else ''}{row['PositionChange']}" if row['PositionChange'] != 0 else 'No change',
-            textposition='outside',
-            name=row['Driver'],
-            showlegend=False,
-            hoverinfo='text',
-            hovertext=f"{row['Driver']} ({row['Constructor']})<br>Start: P{row['Grid']}<br>Finish: P{row['Position']}<br>Change: {'+' if row['PositionChange'] > 0 else ''}{row['PositionChange']}"
-        ))
+    # One bar trace for the whole field; colors, labels and hover text are arrays
+    fig = go.Figure(go.Bar(
+        y=drivers.to_numpy(),
+        x=np.where(change != 0, np.abs(change), 0.5),
+        orientation='h',
+        marker_color=np.select([change > 0, change < 0], ['green', 'red'], 'gray'),
+        text=np.where(change != 0, change_text.to_numpy(), 'No change'),
+        textposition='outside',
+        showlegend=False,
+        hoverinfo='text',
+        hovertext=hover.to_numpy(),
+    ))
     
     # Customize layout
     fig.update_layout(
@@ -70,7 +66,7 @@ def create_lap_times_chart(laps_df, driver_id=None):
     Create a visualization of lap times during a race
     
     Args:
-        laps_df: DataFrame with lap time data
+        laps_df: DataFrame with lap time data (Time in seconds)
         driver_id: Optional driver ID to filter by
         
     Returns:
@@ -79,9 +75,6 @@ def create_lap_times_chart(laps_df, driver_id=None):
     if laps_df.empty:
         return None
     
-    # Convert lap times to seconds for better visualization
-    laps_df['TimeSeconds'] = laps_df['Time'].apply(time_to_seconds)
-    
     # Filter by driver if specified
     if driver_id:
         filtered_df = laps_df[laps_df['DriverID'] == driver_id]
@@ -95,9 +88,9 @@ def create_lap_times_chart(laps_df, driver_id=None):
     fig = px.line(
         filtered_df, 
         x='Lap', 
-        y='TimeSeconds',
+        y='Time',
         color='DriverID',
-        labels={'TimeSeconds': 'Lap Time (seconds)', 'Lap': 'Lap Number'},
+        labels={'Time': 'Lap Time (seconds)', 'Lap': 'Lap Number'},
         title=f"Lap Times" + (f" for {driver_id}" if driver_id else ""),
         height=400,
     )
@@ -1,6 +1,8 @@
 import plotly.express as px
 from utils.helpers import get_team_colors
+from visualizations.figure_cache import cached_figure
 
+@cached_figure
 def create_driver_standings_chart(df):
     """
     Create a bar chart visualization for driver standings
@@ -53,6 +55,7 @@ def create_driver_standings_chart(df):
     
     return fig
 
+@cached_figure
 def create_constructor_standings_chart(df):
     """
     Create a bar chart visualization for constructor standings